@@ -0,0 +1,69 @@
+# Пропускная способность расчёта нормы и итогов дня: по одному пользователю на Python
+# против пакетного расчёта на numpy
+import argparse
+import time
+
+import numpy as np
+from synthetic import syntheticValues
+
+from calculator import DayTotals, balance, balanceBatch, normalCalories, portion, portionsBatch
+
+
+def syntheticProfiles(count: int, entries: int, dishes: int, seed: int = 0):
+    # Профили пользователей и их записи дневника: номер блюда и вес порции
+    rng = np.random.default_rng(seed)
+    male = rng.random(count) < 0.5
+    age = rng.integers(16, 80, count)
+    height = rng.integers(150, 200, count)
+    weight = rng.integers(45, 120, count)
+    users = np.repeat(np.arange(count), entries)
+    meals = rng.integers(0, dishes, count * entries)
+    grams = rng.integers(50, 400, count * entries).astype(np.float64)
+    return male, age, height, weight, users, meals, grams
+
+
+def perUser(catalogue, male, age, height, weight, users, meals, grams) -> list:
+    # Прежний путь: каждый пользователь и каждая запись обрабатываются по отдельности
+    result = []
+    entry = 0
+    for i in range(len(male)):
+        normal = normalCalories(bool(male[i]), float(age[i]), float(height[i]), float(weight[i]))
+        totals = DayTotals()
+        while entry < len(users) and users[entry] == i:
+            totals.add(portion(catalogue[meals[entry]], float(grams[entry])))
+            entry += 1
+        result.append(balance(normal, totals))
+    return result
+
+
+def batch(catalogue, male, age, height, weight, users, meals, grams) -> dict:
+    # Пакетный путь: состав порций и итоги всех пользователей несколькими векторными операциями
+    return balanceBatch(male, age, height, weight, users, portionsBatch(catalogue, meals, grams))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пропускная способность расчёта итогов дня")
+    parser.add_argument("--users", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--entries", type=int, default=5, help="записей дневника на пользователя")
+    parser.add_argument("--python-limit", type=int, default=100_000,
+                        help="не запускать расчёт по одному пользователю на большем числе пользователей")
+    args = parser.parse_args()
+
+    catalogue = syntheticValues(1000)
+    print(f"{'польз.':>9} {'Python, польз./с':>18} {'numpy, польз./с':>18} {'ускорение':>10}")
+    for count in args.users:
+        data = syntheticProfiles(count, args.entries, len(catalogue))
+
+        start = time.perf_counter()
+        result = batch(catalogue, *data)
+        vectorized = time.perf_counter() - start
+
+        if count <= args.python_limit:
+            start = time.perf_counter()
+            expected = perUser(catalogue, *data)
+            scalar = time.perf_counter() - start
+            # Оба пути должны давать одинаковый результат
+            assert np.allclose(result["remaining_kcal"], [row["remaining_kcal"] for row in expected], atol=0.01)
+            print(f"{count:>9} {count / scalar:18,.0f} {count / vectorized:18,.0f} {scalar / vectorized:10.1f}")
+        else:
+            print(f"{count:>9} {'-':>18} {count / vectorized:18,.0f} {'-':>10}")
@@ -0,0 +1,48 @@
+# Отчёт о времени запуска: чтение excel (холодный старт) против чтения снимка (тёплый старт)
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from synthetic import syntheticFrame
+
+from database import Database
+
+
+def startup(path: str, cache: bool) -> float:
+    # Время создания базы данных из файла, в секундах
+    start = time.perf_counter()
+    Database(path, cache=cache)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Холодный и тёплый старт базы данных")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--file", help="замерить существующий excel файл вместо синтетических")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        if args.file:
+            path = os.path.join(workdir, os.path.basename(args.file))
+            shutil.copy(args.file, path)
+            paths = [path]
+        else:
+            paths = []
+            for size in args.sizes:
+                path = os.path.join(workdir, f"блюда_{size}.xlsx")
+                syntheticFrame(size).to_excel(path, index=False)
+                paths.append(path)
+
+        print(f"{'файл':>20} {'блюд':>8} {'без снимка, мс':>16} {'сборка снимка, мс':>18} {'со снимком, мс':>16}")
+        for path in paths:
+            shutil.rmtree(Database.cachePath(path), ignore_errors=True)
+            cold = startup(path, cache=False)
+            build = startup(path, cache=True)
+            warm = min(startup(path, cache=True) for _ in range(5))
+            count = len(Database(path))
+            print(f"{os.path.basename(path):>20} {count:>8} {cold * 1000:16.1f} {build * 1000:18.1f} {warm * 1000:16.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
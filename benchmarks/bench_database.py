@@ -0,0 +1,43 @@
+# Бенчмарк загрузки каталога блюд: старый построчный цикл против столбцового Database
+import argparse
+import time
+
+from synthetic import syntheticFrame
+
+from database import Database
+
+
+def legacyLoad(sheet) -> dict:
+    # Прежняя реализация Database.__init__: sheet.values пересобирается на каждой итерации
+    dishes = {}
+    for i in sheet.index:
+        dishes.update({sheet.values[i][0]: sheet.values[i][1:]})
+    return dishes
+
+
+def measure(function, *args, repeat: int = 3) -> float:
+    # Лучшее время из нескольких запусков, в секундах
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время загрузки каталога блюд")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--legacy-limit", type=int, default=2_000,
+                        help="не запускать старый (квадратичный) загрузчик на каталогах больше этого размера")
+    args = parser.parse_args()
+
+    print(f"{'строк':>8} {'старый, мс':>12} {'новый, мс':>12}")
+    for size in args.sizes:
+        frame = syntheticFrame(size)
+        new = measure(Database.fromFrame, frame)
+        if size <= args.legacy_limit:
+            old = f"{measure(legacyLoad, frame, repeat=1) * 1000:12.1f}"
+        else:
+            old = f"{'-':>12}"
+        print(f"{size:>8} {old} {new * 1000:12.1f}")
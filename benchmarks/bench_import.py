@@ -0,0 +1,41 @@
+# Время импорта базы данных из нескольких excel файлов: последовательный разбор листов
+# против разбора в пуле процессов
+import argparse
+import os
+import tempfile
+import time
+
+from synthetic import syntheticFrame
+
+from importer import importCatalogue
+
+
+def writeWorkbooks(directory: str, files: int, sheets: int, rows: int) -> list:
+    # Синтетические книги с несколькими листами; часть блюд повторяется в соседних листах
+    import pandas as pd
+    paths = []
+    for i in range(files):
+        path = os.path.join(directory, f"блюда_{i}.xlsx")
+        with pd.ExcelWriter(path) as writer:
+            for j in range(sheets):
+                syntheticFrame(rows, seed=i * sheets + j).to_excel(writer, sheet_name=f"лист {j}", index=False)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время импорта базы данных из нескольких excel файлов")
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--sheets", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=10_000, help="блюд на каждом листе")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = writeWorkbooks(directory, args.files, args.sheets, args.rows)
+        for workers in (1, args.workers):
+            start = time.perf_counter()
+            db, report = importCatalogue(paths, workers)
+            elapsed = time.perf_counter() - start
+            print(f"процессов: {workers}, время: {elapsed:.2f} с, блюд: {len(db)}, конфликтов: {len(report.conflicts)}")
+        print(report.format().replace(directory + os.sep, ""))
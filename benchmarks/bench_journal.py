@@ -0,0 +1,97 @@
+# Журнал дневника питания за несколько лет: скорость записи, открытие дня
+# и итоги по неделям и месяцам по дневным суммам против повторного просмотра записей
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+import numpy as np
+from synthetic import syntheticNames, syntheticValues
+from utils import percentile
+
+from calculator import portion
+from journal import Journal
+
+
+def fillJournal(journal: Journal, days: int, perDay: int, seed: int = 0) -> tuple:
+    # Синтетический журнал: блюда за каждый день, часть из них потом меняет вес или удаляется.
+    # Возвращает первый и последний день и число записей журнала
+    rng = np.random.default_rng(seed)
+    names = syntheticNames(1000, seed)
+    values = syntheticValues(1000, seed)
+    last = datetime.date(2026, 1, 1)
+    first = last - datetime.timedelta(days=days - 1)
+    records = 0
+    for offset in range(days):
+        day = first + datetime.timedelta(days=offset)
+        rows = []
+        for dish in rng.integers(0, len(names), perDay).tolist():
+            entry = journal.newEntry()
+            journal.add(day, entry, names[dish], values[dish])
+            rows.append((entry, dish, values[dish]))
+        for entry, dish, old in rows[:perDay // 4]:
+            # Каждое четвёртое блюдо меняет вес
+            journal.replace(day, entry, names[dish], old, portion(values[dish], float(rng.integers(50, 400))))
+        for entry, dish, old in rows[-(perDay // 10 or 1):]:
+            # И примерно каждое десятое удаляется
+            journal.remove(day, entry, old)
+        records += perDay + perDay // 4 + (perDay // 10 or 1)
+    return first, last, records
+
+
+def scanPeriods(journal: Journal, first: datetime.date, last: datetime.date) -> dict:
+    # Итоги по месяцам без дневных сумм: каждый день восстанавливается из записей журнала
+    result = {}
+    day = first
+    while day <= last:
+        sums = result.setdefault(day.replace(day=1), [0.0] * 5)
+        for _, _, values in journal.day(day):
+            sums[:] = [total + value for total, value in zip(sums, values)]
+        day += datetime.timedelta(days=1)
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Журнал дневника питания за несколько лет")
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=15, help="блюд в день")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "дневник.sqlite")
+        journal = Journal(path)
+        start = time.perf_counter()
+        first, last, records = fillJournal(journal, 365 * args.years, args.per_day)
+        elapsed = time.perf_counter() - start
+        print(f"запись: {records} записей за {elapsed:.2f} с, {elapsed / records * 1e6:.0f} мкс на запись, "
+              f"файл {os.path.getsize(path) / 2 ** 20:.1f} МБ")
+        journal.close()
+
+        # Открытие журнала и восстановление случайных дней, как при запуске приложения
+        start = time.perf_counter()
+        journal = Journal(path)
+        print(f"открытие журнала: {(time.perf_counter() - start) * 1000:.1f} мс")
+        rng = np.random.default_rng(1)
+        samples = []
+        for offset in rng.integers(0, 365 * args.years, 200).tolist():
+            start = time.perf_counter()
+            journal.day(first + datetime.timedelta(days=offset))
+            samples.append(time.perf_counter() - start)
+        print(f"открытие дня: p50 {percentile(samples, 0.5) * 1000:.3f} мс, p95 {percentile(samples, 0.95) * 1000:.3f} мс")
+
+        for period in ("week", "month"):
+            start = time.perf_counter()
+            journal.periods(first, last, period)
+            print(f"итоги по периодам ({period}) за {args.years} лет по дневным суммам: "
+                  f"{(time.perf_counter() - start) * 1000:.1f} мс")
+        start = time.perf_counter()
+        journal.total(last - datetime.timedelta(days=364), last)
+        print(f"итог за последний год по дневным суммам: {(time.perf_counter() - start) * 1000:.2f} мс")
+
+        start = time.perf_counter()
+        expected = scanPeriods(journal, first, last)
+        print(f"итоги по месяцам с просмотром всех записей: {(time.perf_counter() - start) * 1000:.1f} мс")
+        months = {start: sums for start, sums, _ in journal.periods(first, last, "month")}
+        assert all(np.allclose(months[start], sums) for start, sums in expected.items())
+        journal.close()
@@ -0,0 +1,40 @@
+# Подбор блюд на остаток нормы: задержка и доля попаданий в допуск
+# в зависимости от размера базы данных и числа учитываемых показателей
+import argparse
+import time
+
+import numpy as np
+from synthetic import syntheticNames, syntheticValues
+from utils import percentile
+
+from database import Database
+from planner import planMeals
+
+
+def reachableTargets(db: Database, count: int, seed: int = 0) -> list:
+    # Остатки нормы, которые точно можно закрыть блюдами базы: состав случайных трёх порций
+    rng = np.random.default_rng(seed)
+    return [db.perGram[rng.integers(0, len(db), 3)].T @ rng.uniform(50, 300, 3) for _ in range(count)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Задержка и точность подбора блюд")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--exclude", type=int, default=0, help="число исключённых блюд в каждом запросе")
+    args = parser.parse_args()
+
+    print(f"{'блюд':>8} {'показ.':>7} {'p50, мс':>9} {'p95, мс':>9} {'в допуске':>10}")
+    for size in args.sizes:
+        db = Database.fromColumns(syntheticNames(size), syntheticValues(size))
+        targets = reachableTargets(db, args.queries)
+        exclude = np.random.default_rng(1).choice(size, args.exclude, replace=False)
+        for constraints in range(1, 5):
+            samples, within = [], 0
+            for target in targets:
+                start = time.perf_counter()
+                plan = planMeals(db, target, constraints=constraints, exclude=exclude)
+                samples.append(time.perf_counter() - start)
+                within += plan.within
+            print(f"{size:>8} {constraints:>7} {percentile(samples, 0.5) * 1000:9.2f} "
+                  f"{percentile(samples, 0.95) * 1000:9.2f} {within / len(targets):10.0%}")
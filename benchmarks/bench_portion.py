@@ -0,0 +1,45 @@
+# Пересчёт состава порции при правке веса: по эталонной порции, по коэффициентам на грамм
+# и по коэффициентам с кешем частых порций
+import argparse
+import time
+
+import numpy as np
+from synthetic import syntheticNames, syntheticValues
+from utils import percentile
+
+from calculator import portion
+from database import Database
+
+
+def latency(scale, dishes, weights) -> list:
+    samples = []
+    for dish, weight in zip(dishes, weights):
+        start = time.perf_counter()
+        scale(dish, weight)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пересчёт состава порции при правке веса")
+    parser.add_argument("--dishes", type=int, default=100_000)
+    parser.add_argument("--edits", type=int, default=100_000)
+    args = parser.parse_args()
+
+    db = Database.fromColumns(syntheticNames(args.dishes), syntheticValues(args.dishes))
+    rng = np.random.default_rng(0)
+    # Пользователи чаще едят одни и те же блюда привычными порциями
+    dishes = rng.zipf(1.5, args.edits) % 200
+    weights = rng.choice([50.0, 100.0, 150.0, 200.0, 250.0, 300.0], args.edits)
+    dishes, weights = dishes.tolist(), weights.tolist()
+
+    modes = (
+        ("эталонная порция", lambda dish, weight: portion(db.row(dish), weight)),
+        ("на грамм", db.computePortion),
+        ("на грамм + кеш", db.portion),
+    )
+    print(f"{'режим':>18} {'p50, мкс':>10} {'p95, мкс':>10}")
+    for mode, scale in modes:
+        samples = latency(scale, dishes, weights)
+        print(f"{mode:>18} {percentile(samples, 0.5) * 1e6:10.2f} {percentile(samples, 0.95) * 1e6:10.2f}")
+    print(db.portion.cache_info())
@@ -0,0 +1,70 @@
+# Применение изменённой базы данных: разница между версиями и обновление только изменившихся строк
+# против полной замены списка блюд
+import argparse
+import sys
+import time
+
+import numpy as np
+from synthetic import syntheticNames, syntheticValues
+import utils  # noqa: F401 - устанавливает платформу offscreen
+
+from PySide6 import QtWidgets
+
+from database import Database
+
+
+def editedVersion(db: Database, changes: int, seed: int = 1) -> Database:
+    # Новая версия базы: changes блюд удалено, столько же изменено и добавлено
+    rng = np.random.default_rng(seed)
+    picked = rng.choice(len(db), 2 * changes, replace=False)
+    removed, changed = set(picked[:changes].tolist()), picked[changes:]
+    values = np.array(db.values)
+    values[changed, 1] += 1
+    keep = [i for i in range(len(db)) if i not in removed]
+    names = [db.dishesNames[i] for i in keep] + [f"Новое блюдо {i}" for i in range(changes)]
+    return Database.fromColumns(names, np.vstack([values[keep], syntheticValues(changes, seed)]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Применение изменённой базы данных")
+    parser.add_argument("--dishes", type=int, default=100_000)
+    parser.add_argument("--changes", type=int, nargs="+", default=[1, 10, 16, 100, 1000])
+    parser.add_argument("--rows", type=int, default=50, help="строк в дневнике")
+    args = parser.parse_args()
+
+    application = QtWidgets.QApplication([])
+    import main
+
+    db = Database.fromColumns(syntheticNames(args.dishes), syntheticValues(args.dishes))
+
+    def applyTime(new: Database, threshold: int) -> float:
+        # Время применения изменений в потоке интерфейса; threshold заменяет MyApp.MAX_ROW_CHANGES,
+        # чтобы замерить оба способа обновления списка блюд при любом числе изменений
+        window = main.MyApp(db)
+        window.MAX_ROW_CHANGES = threshold
+        for dish in range(0, args.dishes, args.dishes // args.rows)[:args.rows]:
+            window.log.appendEntry(dish)
+        added, removed, changed = db.diff(new)
+        ordered, mapping = db.keepOrder(new)
+        start = time.perf_counter()
+        window.applyCatalogueChanges((ordered, window.searchIndex, mapping, added, removed, changed))
+        elapsed = time.perf_counter() - start
+        window.deleteLater()
+        return elapsed
+
+    print(f"порог построчного обновления: {main.MyApp.MAX_ROW_CHANGES} изменений")
+    print(f"{'изменений':>10} {'разница, мс':>12} {'по строкам, мс':>15} {'заменой списка, мс':>19}  выбирается")
+    for changes in args.changes:
+        new = editedVersion(db, changes)
+
+        # Работа фонового потока: разница версий и порядок блюд
+        start = time.perf_counter()
+        added, removed, changed = db.diff(new)
+        db.keepOrder(new)
+        worker = time.perf_counter() - start
+
+        # Работа потока интерфейса: обновление списка по строкам и полной заменой
+        rows = applyTime(new, sys.maxsize)
+        reset = applyTime(new, -1)
+        chosen = "по строкам" if len(added) + len(removed) <= main.MyApp.MAX_ROW_CHANGES else "замена"
+        print(f"{changes:>10} {worker * 1000:12.1f} {rows * 1000:15.1f} {reset * 1000:19.1f}  {chosen}")
@@ -0,0 +1,77 @@
+# Добавление строк в дневник: задержка, память, число виджетов и время перерисовки.
+# Сравниваются прежняя таблица с виджетами в каждой строке (с копией названий в каждом
+# комбо-боксе и с общей моделью) и таблица на модели с делегатом
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from legacy import LegacyLog
+from synthetic import syntheticNames, syntheticValues
+from utils import percentile, rssMegabytes
+
+from PySide6 import QtCore, QtWidgets
+
+from database import Database
+from main import DishListModel, MyApp
+
+
+def run(mode: str, dishes: int, rows: int) -> None:
+    # Замер в отдельном процессе, чтобы память разных режимов не смешивалась
+    application = QtWidgets.QApplication([])
+    db = Database.fromColumns(syntheticNames(dishes), syntheticValues(dishes))
+    if mode == "model":
+        window = MyApp(db)
+        table = window.table
+    else:
+        window = table = LegacyLog(db, DishListModel(db) if mode == "shared" else None)
+    window.resize(900, 600)
+    window.show()
+    application.processEvents()
+
+    before = rssMegabytes()
+    samples = []
+    for _ in range(rows):
+        start = time.perf_counter()
+        window.addItem()
+        application.processEvents()
+        # Удаляем закрытые редакторы так же, как это делает цикл событий приложения
+        application.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+        samples.append(time.perf_counter() - start)
+    after = rssMegabytes()
+
+    # Полная перерисовка видимой части таблицы и прокрутка в конец
+    start = time.perf_counter()
+    for _ in range(10):
+        table.viewport().repaint()
+    repaint = (time.perf_counter() - start) / 10
+    start = time.perf_counter()
+    table.scrollToBottom()
+    table.viewport().repaint()
+    scroll = time.perf_counter() - start
+
+    widgets = len(QtWidgets.QApplication.allWidgets())
+    print(f"{mode:>8} {dishes:>8} {rows:>6} {percentile(samples, 0.5) * 1000:10.2f} "
+          f"{percentile(samples, 0.95) * 1000:10.2f} {after - before:10.1f} {widgets:>8} "
+          f"{repaint * 1000:10.2f} {scroll * 1000:10.2f}", flush=True)
+    # Завершаем процесс сразу, не дожидаясь разрушения виджетов при выходе интерпретатора
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Задержка добавления строки, память и перерисовка")
+    parser.add_argument("--dishes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--mode", choices=["legacy", "shared", "model"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.dishes[0], args.rows)
+    else:
+        print(f"{'режим':>8} {'блюд':>8} {'строк':>6} {'p50, мс':>10} {'p95, мс':>10} {'+RSS, МБ':>10} "
+              f"{'виджетов':>8} {'отрис., мс':>10} {'прокр., мс':>10}", flush=True)
+        for dishes in args.dishes:
+            for mode in ("legacy", "shared", "model"):
+                subprocess.run([sys.executable, __file__, "--mode", mode,
+                                "--dishes", str(dishes), "--rows", str(args.rows)], check=True)
@@ -0,0 +1,46 @@
+# Время построения индекса поиска блюд и задержка поиска при наборе текста
+import argparse
+import time
+
+from synthetic import syntheticNames
+from utils import percentile
+
+from search import DishSearchIndex
+
+# Запросы разных видов: начало названия, начало второго слова, несколько слов, опечатки
+QUERIES = {
+    "префикс": ["с", "су", "суп", "каш", "компот", "ёж", "Хлеб"],
+    "слово": ["рис", "салат", "чай", "блин"],
+    "слова": ["суп рис", "чай ёж", "каша сыр 5", "ёж чай 99"],
+    "опечатка": ["кампот", "борщ", "амлет", "гуляж", "филле"],
+}
+
+
+def typing(query: str) -> list:
+    # Все промежуточные строки при наборе запроса по одному символу
+    return [query[:i] for i in range(1, len(query) + 1)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Поиск блюд по названию")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'блюд':>8} {'индекс, мс':>12} {'запросы':>10} {'p50, мс':>10} {'p95, мс':>10} {'max, мс':>10}")
+    for size in args.sizes:
+        names = syntheticNames(size)
+        start = time.perf_counter()
+        index = DishSearchIndex(names)
+        build = time.perf_counter() - start
+
+        for kind, queries in QUERIES.items():
+            samples = []
+            for query in queries:
+                for text in typing(query):
+                    for _ in range(args.repeat):
+                        start = time.perf_counter()
+                        index.search(text)
+                        samples.append(time.perf_counter() - start)
+            print(f"{size:>8} {build * 1000:12.1f} {kind:>10} {percentile(samples, 0.5) * 1000:10.3f} "
+                  f"{percentile(samples, 0.95) * 1000:10.3f} {max(samples) * 1000:10.3f}", flush=True)
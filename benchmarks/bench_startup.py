@@ -0,0 +1,90 @@
+# Время до первой отрисовки окна и до возможности работы с ним:
+# загрузка базы данных в потоке интерфейса против загрузки в фоновом потоке
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Отсчёт времени идёт от запуска процесса, до импорта Qt и модулей приложения
+START = time.perf_counter()
+
+import utils  # noqa: F401 - устанавливает платформу offscreen
+from synthetic import syntheticFrame
+
+
+def run(mode: str, path: str) -> None:
+    # Один запуск окна в отдельном процессе: печатает время первой отрисовки и время готовности в мс
+    from PySide6 import QtCore, QtWidgets
+
+    application = QtWidgets.QApplication([])
+    import main
+    from database import Database
+
+    times = {}
+
+    class PaintWatcher(QtCore.QObject):
+        # Запоминает момент первой отрисовки окна
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Type.Paint and "paint" not in times:
+                times["paint"] = time.perf_counter()
+            return False
+
+    watcher = PaintWatcher()
+    if mode == "sync":
+        # Прежний порядок: база данных читается до создания окна
+        window = main.MyApp(Database(path))
+        window.installEventFilter(watcher)
+        window.show()
+    else:
+        window = main.MyApp(excelPath=path)
+        window.installEventFilter(watcher)
+        window.catalogueLoaded.connect(lambda: times.setdefault("ready", time.perf_counter()))
+        window.show()
+
+    while "paint" not in times or (mode != "sync" and "ready" not in times):
+        application.processEvents()
+        time.sleep(0.001)
+    # Без фоновой загрузки окном можно пользоваться сразу после его появления
+    ready = max(times["paint"], times.get("ready", times["paint"]))
+    print(f"{(times['paint'] - START) * 1000:.0f} {(ready - START) * 1000:.0f}", flush=True)
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Время до первой отрисовки и до готовности окна")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 100_000],
+                        help="размеры синтетических баз данных (0 - файл блюда.xlsx)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mode", choices=["sync", "async"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.path)
+
+    workdir = tempfile.mkdtemp()
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        print(f"{'блюд':>8} {'снимок':>7} {'режим':>6} {'отрисовка, мс':>14} {'готовность, мс':>15}")
+        for size in args.sizes:
+            path = os.path.join(workdir, f"блюда_{size}.xlsx")
+            if size:
+                syntheticFrame(size).to_excel(path, index=False)
+            else:
+                shutil.copy(os.path.join(root, "блюда.xlsx"), path)
+            for cache in ("нет", "есть"):
+                for mode in ("sync", "async"):
+                    samples = []
+                    for _ in range(args.repeat):
+                        if cache == "нет":
+                            shutil.rmtree(path + ".cache", ignore_errors=True)
+                        output = subprocess.run([sys.executable, __file__, "--mode", mode, "--path", path],
+                                                capture_output=True, text=True, check=True).stdout
+                        samples.append([float(value) for value in output.split()])
+                    paint, ready = (min(values) for values in zip(*samples))
+                    print(f"{size:>8} {cache:>7} {mode:>6} {paint:14.0f} {ready:15.0f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
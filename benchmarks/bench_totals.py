@@ -0,0 +1,54 @@
+# Задержка правки веса в строке дневника: пересчёт итогов по всей таблице против
+# обновления итогов на разницу в модели дневника
+import argparse
+import os
+import time
+
+from legacy import LegacyLog
+from synthetic import syntheticNames, syntheticValues
+from utils import percentile
+
+from PySide6 import QtWidgets
+
+from database import Database
+from main import MyApp
+
+
+def editLatency(edit, rows: int, edits: int) -> list:
+    # Правим вес в разных строках так же часто, как это делает пользователь при наборе текста
+    samples = []
+    for i in range(edits):
+        text = str(100 + i % 50)
+        start = time.perf_counter()
+        edit(i * 7919 % rows, text)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Задержка правки веса при разном размере дневника")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--edits", type=int, default=200)
+    args = parser.parse_args()
+
+    application = QtWidgets.QApplication([])
+    db = Database.fromColumns(syntheticNames(1000), syntheticValues(1000))
+
+    print(f"{'строк':>6} {'режим':>8} {'p50, мс':>10} {'p95, мс':>10}")
+    for rows in args.rows:
+        legacy = LegacyLog(db)
+        window = MyApp(db)
+        for _ in range(rows):
+            legacy.addItem()
+            window.log.appendEntry(0)
+
+        # В модели правка веса - это запись в модель, которую делает делегат при каждом нажатии клавиши
+        def modelEdit(row, text):
+            window.log.setData(window.log.index(row, 1), float(text))
+
+        for mode, edit in (("legacy", legacy.editWeight), ("model", modelEdit)):
+            samples = editLatency(edit, rows, args.edits)
+            print(f"{rows:>6} {mode:>8} {percentile(samples, 0.5) * 1000:10.3f} "
+                  f"{percentile(samples, 0.95) * 1000:10.3f}", flush=True)
+    # Завершаем процесс сразу, не дожидаясь разрушения виджетов при выходе интерпретатора
+    os._exit(0)
@@ -0,0 +1,64 @@
+# Прежняя реализация дневника питания (QTableWidget с виджетами в каждой строке) для сравнения в бенчмарках
+from PySide6 import QtWidgets
+from PySide6.QtCore import Qt
+
+
+class LegacyLog(QtWidgets.QTableWidget):
+    def __init__(self, db, sharedModel=None):
+        super().__init__(minimumHeight=256)
+        self.db = db
+        # Общая модель списка блюд (если задана) вместо копии названий в каждой строке
+        self.sharedModel = sharedModel
+        self.setColumnCount(7)
+        self.setHorizontalHeaderLabels(["Продукт", "Вес, г", "Ккал", "Белки", "Жиры", "Углеводы", "X"])
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        # Строка с кнопкой " + " и строка итогов
+        for row in range(2):
+            self.insertRow(row)
+        self.setCellWidget(0, 3, QtWidgets.QPushButton(" + "))
+        self.setCellWidget(1, 0, QtWidgets.QLabel("Итог: "))
+
+    def addItem(self):
+        row = self.rowCount() - 2
+        self.insertRow(row)
+        comboBox = QtWidgets.QComboBox()
+        if self.sharedModel is None:
+            comboBox.addItems(self.db.dishesNames)
+        else:
+            comboBox.setModel(self.sharedModel)
+            comboBox.setSizeAdjustPolicy(QtWidgets.QComboBox.AdjustToMinimumContentsLengthWithIcon)
+            comboBox.view().setUniformItemSizes(True)
+        self.setCellWidget(row, 0, comboBox)
+        dataRow = self.db.row(0)
+        weight = QtWidgets.QLineEdit(f"{dataRow[0]:g}", alignment=Qt.AlignCenter)
+        weight.textEdited.connect(self.updateResults)
+        self.setCellWidget(row, 1, weight)
+        for column in range(2, self.columnCount() - 1):
+            self.setItem(row, column, QtWidgets.QTableWidgetItem(f"{dataRow[column - 1]:g}"))
+        self.setCellWidget(row, 6, QtWidgets.QPushButton("X"))
+        self.updateResults()
+
+    def updateResults(self):
+        # Каждое обновление перебирает все строки и заново разбирает текст ячеек
+        resultsRow = self.rowCount() - 1
+        for column in range(1, self.columnCount() - 1):
+            columnSum = self.getSumOfColum(column)
+            self.setItem(resultsRow, column, QtWidgets.QTableWidgetItem(f"{columnSum:.2f}"))
+
+    def getSumOfColum(self, columIndex):
+        columnSum = 0
+        try:
+            for row in range(self.rowCount() - 2):
+                item = self.item(row, columIndex)
+                columnSum += float(item.text() if item.text() != '' else 0)
+        except AttributeError:
+            for row in range(self.rowCount() - 2):
+                item = self.cellWidget(row, columIndex)
+                columnSum += float(item.text() if item.text() != '' else 0)
+        return columnSum
+
+    def editWeight(self, row, text):
+        # Правка веса так, как её делает пользователь
+        weight = self.cellWidget(row, 1)
+        weight.setText(text)
+        weight.textEdited.emit(text)
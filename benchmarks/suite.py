@@ -0,0 +1,147 @@
+# Набор бенчмарков медленных мест интерфейса без дисплея (платформа offscreen).
+# Для каждого размера синтетической базы данных отдельный процесс со включённым замером (instrumentation.py)
+# вызывает слоты приложения много раз; результаты - гистограммы задержек и число виджетов.
+#   python benchmarks/suite.py --output result.json
+#   python benchmarks/suite.py --compare result.json  # сравнение с прошлым запуском
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def run(dishes: int, rows: int, repeat: int, output: str) -> None:
+    # Один прогон в отдельном процессе: замер включается до импорта модулей приложения
+    os.environ["CALORIES_INSTRUMENT"] = output
+    import numpy as np
+    import utils  # noqa: F401 - устанавливает платформу offscreen
+    from synthetic import syntheticFrame
+
+    from PySide6 import QtCore, QtWidgets
+
+    application = QtWidgets.QApplication([])
+    import instrumentation
+    import main
+    from database import Database
+    from planner import planMeals
+    from theme import applyTheme
+
+    def settle():
+        # Обработка событий, включая отложенное удаление закрытых редакторов
+        application.processEvents()
+        application.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as directory:
+        # Чтение excel файла (первый раз - с созданием снимка, затем - из снимка)
+        path = os.path.join(directory, "блюда.xlsx")
+        syntheticFrame(dishes).to_excel(path, index=False)
+        for _ in range(repeat):
+            db = Database(path)
+
+    for _ in range(repeat):
+        applyTheme(application)
+
+    window = main.MyApp(db)
+    window.show()
+    settle()
+
+    # Добавление строк кнопкой " + " и правка блюда и веса, как это делает делегат
+    for i in range(rows):
+        window.addItem()
+        if i % 10 == 0:
+            settle()
+    log = window.log
+    for row in rng.integers(0, rows, rows * repeat).tolist():
+        log.setData(log.index(row, log.WEIGHT), float(rng.integers(50, 400)))
+    for row in rng.integers(0, rows, rows).tolist():
+        log.setData(log.index(row, log.DISH), int(rng.integers(0, dishes)))
+    settle()
+
+    # Ввод возраста, роста и веса и выбор пола: слот вызывается через сигналы полей, как при вводе
+    # с клавиатуры, чтобы замер проверял и подключение слота к сигналам с аргументами
+    for i in range(rows * repeat):
+        for field, text in ((window.age, 20 + i % 50), (window.height, 150 + i % 50), (window.weight, 50 + i % 50)):
+            field.setText(str(text))
+            field.textEdited.emit(field.text())
+        if i % 10 == 0:
+            window.womenGender.setChecked(not window.womenGender.isChecked())
+    if window.normal <= 0:
+        raise RuntimeError("норма калорий не обновилась после ввода параметров")
+
+    # Подсказки при наборе названия блюда: запросы по буквам
+    # Подсказки привязаны к полю ввода, как в редакторе блюда
+    edit = QtWidgets.QLineEdit(window)
+    completer = main.DishCompleter(window.searchIndex, edit)
+    edit.setCompleter(completer)
+    for name in rng.choice(db.dishesNames, rows).tolist():
+        for length in range(1, min(len(name), 8) + 1):
+            completer.search(name[:length])
+    completer.popup().hide()
+
+    # Подбор блюд на остаток нормы
+    for _ in range(repeat * 10):
+        remaining = np.array([window.normal, 100, 60, 250]) - log.totals.sums[1:]
+        planMeals(db, np.maximum(remaining, [500, 20, 10, 50]))
+
+    # Удаление половины строк
+    for _ in range(rows // 2):
+        window.removeRow(int(rng.integers(0, log.count)))
+    settle()
+
+    instrumentation.dump(output)
+    # Завершаем процесс сразу, не дожидаясь разрушения виджетов при выходе интерпретатора
+    os._exit(0)
+
+
+def printReport(results: dict, baseline: dict = None, threshold: float = 1.5) -> None:
+    # Таблица задержек по каждому месту; при сравнении - отношение p95 к прошлому запуску
+    for size, result in results.items():
+        widgets = result["widgets"]
+        print(f"\nблюд: {size}, виджетов: {widgets['last']} (наибольшее {widgets['max']})")
+        print(f"{'место':<38} {'вызовов':>8} {'p50, мс':>9} {'p95, мс':>9} {'макс, мс':>9}"
+              + (f" {'p95 / было':>11}" if baseline else ""))
+        for name, histogram in result["histograms"].items():
+            line = (f"{name:<38} {histogram['count']:>8} {histogram['p50_ms']:9.3f} "
+                    f"{histogram['p95_ms']:9.3f} {histogram['max_ms']:9.2f}")
+            old = (baseline or {}).get(size, {}).get("histograms", {}).get(name)
+            if old:
+                ratio = histogram["p95_ms"] / max(old["p95_ms"], 1e-6)
+                line += f" {ratio:11.2f}"
+                if ratio > threshold and histogram["p95_ms"] - old["p95_ms"] > 0.05:
+                    line += "  РЕГРЕССИЯ"
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Бенчмарки медленных мест интерфейса")
+    parser.add_argument("--dishes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--rows", type=int, default=200, help="строк в дневнике")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="сохранить результаты в json файл")
+    parser.add_argument("--compare", help="json файл прошлого запуска для сравнения")
+    parser.add_argument("--run", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--run-output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        run(args.run, args.rows, args.repeat, args.run_output)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for dishes in args.dishes:
+            output = os.path.join(directory, f"{dishes}.json")
+            subprocess.run([sys.executable, __file__, "--run", str(dishes), "--run-output", output,
+                            "--rows", str(args.rows), "--repeat", str(args.repeat)], check=True)
+            with open(output, encoding="utf-8") as f:
+                results[str(dishes)] = json.load(f)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    printReport(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
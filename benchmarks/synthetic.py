@@ -0,0 +1,41 @@
+# Генерация синтетических данных для бенчмарков
+import os
+import sys
+
+import numpy as np
+
+# Добавляем корень репозитория в путь поиска модулей, чтобы бенчмарки можно было запускать как скрипты
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Заголовки столбцов как в файле блюда.xlsx
+HEADERS = ["Блюдо", "Вес,г", "Ккал", "Белки,г", "Жры,г", "Углеводы,г"]
+
+# Слоги, из которых собираются случайные названия блюд
+_SYLLABLES = ["бор", "щи", "каша", "суп", "плов", "ёж", "гуляш", "рис", "сыр", "чай",
+              "хлеб", "блин", "мясо", "филе", "компот", "рагу", "салат", "омлет"]
+
+
+def syntheticNames(count: int, seed: int = 0) -> list:
+    # Уникальные названия блюд вида "Суп рис 123"
+    rng = np.random.default_rng(seed)
+    words = rng.integers(0, len(_SYLLABLES), size=(count, 2))
+    return [f"{_SYLLABLES[a].capitalize()} {_SYLLABLES[b]} {i}" for i, (a, b) in enumerate(words)]
+
+
+def syntheticValues(count: int, seed: int = 0) -> np.ndarray:
+    # Правдоподобный состав блюд: вес, ккал, белки, жиры, углеводы
+    rng = np.random.default_rng(seed)
+    weight = rng.integers(20, 400, size=count).astype(np.float64)
+    protein = np.round(rng.uniform(0, 0.3, size=count) * weight, 1)
+    fat = np.round(rng.uniform(0, 0.2, size=count) * weight, 1)
+    carbs = np.round(rng.uniform(0, 0.5, size=count) * weight, 1)
+    kcal = np.round(4 * protein + 9 * fat + 4 * carbs)
+    return np.column_stack([weight, kcal, protein, fat, carbs])
+
+
+def syntheticFrame(count: int, seed: int = 0):
+    # Таблица pandas в том же виде, в каком её возвращает pd.read_excel
+    import pandas as pd
+    frame = pd.DataFrame(syntheticValues(count, seed), columns=HEADERS[1:])
+    frame.insert(0, HEADERS[0], syntheticNames(count, seed))
+    return frame
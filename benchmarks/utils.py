@@ -0,0 +1,24 @@
+# Общие вспомогательные функции для бенчмарков
+import os
+
+# Бенчмарки интерфейса работают без дисплея
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def rssMegabytes() -> float:
+    # Текущий объём резидентной памяти процесса в мегабайтах
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        # Не Linux: берём максимальный объём памяти за время работы процесса
+        import resource
+        import sys
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 2 ** 20 if sys.platform == "darwin" else maxrss / 2 ** 10
+
+
+def percentile(samples: list, q: float) -> float:
+    # Перцентиль выборки без зависимости от numpy
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
@@ -0,0 +1,250 @@
+# Расчёт нормы калорий и итогов дня без графического интерфейса.
+# Модуль используется окном приложения и может запускаться отдельно для пакетной обработки:
+#   python calculator.py --profiles profiles.csv --log log.jsonl --catalogue блюда.xlsx > result.csv
+
+# Импортирование модулей для чтения и записи csv/jsonl файлов и разбора аргументов командной строки
+import argparse
+import csv
+import json
+import sys
+
+# Импортирование numpy для пакетного расчёта по массивам профилей и записей дневника
+import numpy as np
+
+
+# Коэффициенты формулы Миффлина - Сан Жеора: 9.99 * вес + 6.25 * рост - 4.92 * возраст + поправка на пол
+WEIGHT_FACTOR = 9.99
+HEIGHT_FACTOR = 6.25
+AGE_FACTOR = 4.92
+MALE_OFFSET = 5
+FEMALE_OFFSET = -161
+
+# Доли белков, жиров и углеводов в суточной норме калорий и калорийность одного грамма каждого из них
+MACRO_SHARES = (0.15, 0.30, 0.55)
+MACRO_KCAL = (4.0, 9.0, 4.0)
+
+# Названия столбцов состава блюда: вес, ккал, белки, жиры, углеводы
+COLUMNS = ("weight", "kcal", "protein", "fat", "carbs")
+
+
+def normalCalories(male: bool, age: float, height: float, weight: float) -> float:
+    # Суточная норма калорий по формуле Миффлина - Сан Жеора
+    offset = MALE_OFFSET if male else FEMALE_OFFSET
+    return WEIGHT_FACTOR * weight + HEIGHT_FACTOR * height - AGE_FACTOR * age + offset
+
+
+def macroNorms(normal: float) -> tuple:
+    # Суточная норма белков, жиров и углеводов в граммах для заданной нормы калорий
+    return tuple(normal * share / kcal for share, kcal in zip(MACRO_SHARES, MACRO_KCAL))
+
+
+def portion(values, weight: float) -> list:
+    # Состав порции заданного веса по составу эталонной порции блюда (вес, ккал, белки, жиры, углеводы)
+    reference = float(values[0])
+    scale = weight / reference if reference else 0.0
+    return [weight] + [float(value) * scale for value in values[1:len(COLUMNS)]]
+
+
+'''
+Итоги дня: суммы по столбцам дневника питания.
+Суммы хранятся числами и изменяются на разницу при добавлении, изменении или удалении строки,
+поэтому их не нужно пересчитывать по всей таблице
+'''
+class DayTotals:
+    # Количество столбцов состава: вес, ккал, белки, жиры, углеводы
+    SIZE = len(COLUMNS)
+
+    def __init__(self):
+        self.sums = [0.0] * self.SIZE  # Суммы по столбцам
+
+    def add(self, values) -> None:
+        # Добавление строки: прибавляем её состав к суммам
+        self.sums = [total + float(value) for total, value in zip(self.sums, values)]
+
+    def replace(self, old, new) -> None:
+        # Изменение строки: прибавляем к суммам разницу между новым и старым составом
+        self.sums = [total + float(value) - float(prev) for total, value, prev in zip(self.sums, new, old)]
+
+    def subtract(self, values) -> None:
+        # Удаление строки: вычитаем её состав из сумм
+        self.sums = [total - float(value) for total, value in zip(self.sums, values)]
+
+    def reset(self) -> None:
+        # Пустой дневник - сбрасываем суммы вместе с накопившейся погрешностью вычислений
+        self.sums = [0.0] * self.SIZE
+
+    @property
+    def kcal(self) -> float:
+        return self.sums[1]
+
+
+def balance(normal: float, totals: DayTotals) -> dict:
+    # Норма, съеденное и остаток на день по калориям, белкам, жирам и углеводам
+    norms = (normal,) + macroNorms(normal)
+    eaten = totals.sums[1:]
+    result = {}
+    for name, norm, value in zip(COLUMNS[1:], norms, eaten):
+        result[f"norm_{name}"] = round(norm, 2)
+        result[f"eaten_{name}"] = round(value, 2)
+        result[f"remaining_{name}"] = round(norm - value, 2)
+    return result
+
+
+'''
+Пакетный расчёт по массивам: те же формулы, что и выше, но сразу для всех пользователей
+за несколько векторных операций numpy
+'''
+
+def normalCaloriesBatch(male, age, height, weight) -> np.ndarray:
+    # Суточные нормы калорий для массивов профилей (male - массив bool)
+    offset = np.where(np.asarray(male, dtype=bool), MALE_OFFSET, FEMALE_OFFSET)
+    return (WEIGHT_FACTOR * np.asarray(weight, dtype=np.float64)
+            + HEIGHT_FACTOR * np.asarray(height, dtype=np.float64)
+            - AGE_FACTOR * np.asarray(age, dtype=np.float64) + offset)
+
+
+def portionsBatch(catalogue: np.ndarray, dishes, weights) -> np.ndarray:
+    # Состав порций для массивов номеров блюд и весов порций.
+    # catalogue - матрица состава эталонных порций (вес, ккал, белки, жиры, углеводы)
+    rows = catalogue[np.asarray(dishes)]
+    weights = np.asarray(weights, dtype=np.float64)
+    reference = rows[:, 0]
+    scale = np.divide(weights, reference, out=np.zeros_like(weights), where=reference != 0)
+    result = rows * scale[:, None]
+    result[:, 0] = weights
+    return result
+
+
+def balanceBatch(male, age, height, weight, users, entries) -> dict:
+    # Норма, съеденное и остаток по калориям, белкам, жирам и углеводам для массивов профилей.
+    # entries - матрица записей дневника (вес, ккал, белки, жиры, углеводы),
+    # users - номер профиля для каждой записи
+    normal = normalCaloriesBatch(male, age, height, weight)
+    count = len(normal)
+    users = np.asarray(users, dtype=np.intp)
+    entries = np.asarray(entries, dtype=np.float64).reshape(-1, len(COLUMNS))
+    norms = [normal] + [normal * (share / kcal) for share, kcal in zip(MACRO_SHARES, MACRO_KCAL)]
+
+    result = {}
+    for column, (name, norm) in enumerate(zip(COLUMNS[1:], norms), start=1):
+        # Суммы по пользователям за один проход по записям
+        eaten = np.bincount(users, weights=entries[:, column], minlength=count)
+        result[f"norm_{name}"] = norm
+        result[f"eaten_{name}"] = eaten
+        result[f"remaining_{name}"] = norm - eaten
+    return result
+
+
+'''
+Пакетная обработка: потоковое чтение профилей пользователей и дневников питания
+и потоковая запись итогов по каждому пользователю
+'''
+
+# Столбцы результата пакетной обработки
+OUTPUT_FIELDS = ["user"] + [f"{kind}_{name}" for name in COLUMNS[1:] for kind in ("norm", "eaten", "remaining")]
+
+
+def readRecords(path: str, stream=None):
+    # Построчное чтение записей из csv или jsonl файла ("-" - стандартный ввод в формате jsonl)
+    if path == "-":
+        for line in stream or sys.stdin:
+            if line.strip():
+                yield json.loads(line)
+        return
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def parseSex(value) -> bool:
+    # Пол пользователя: True - мужской, False - женский
+    text = str(value).strip().lower()
+    if text in ("m", "male", "м", "муж", "мужской", "1", "true"):
+        return True
+    if text in ("f", "female", "ж", "жен", "женский", "0", "false"):
+        return False
+    raise ValueError(f"неизвестный пол: {value!r}")
+
+
+def entryValues(entry: dict, catalogue=None) -> list:
+    # Состав записи дневника: либо блюдо из базы данных и вес порции, либо готовые ккал/белки/жиры/углеводы
+    if "dish" in entry and entry["dish"] not in (None, ""):
+        if catalogue is None:
+            raise ValueError("для записей с блюдами нужна база данных (--catalogue)")
+        row = catalogue.find(entry["dish"])
+        if row < 0:
+            raise ValueError(f"блюдо не найдено в базе данных: {entry['dish']!r}")
+        values = catalogue.row(row)
+        weight = entry.get("weight")
+        return portion(values, float(weight)) if weight not in (None, "") else [float(v) for v in values]
+    return [float(entry.get(name) or 0) for name in COLUMNS]
+
+
+def computeBalances(profiles, log, catalogue=None):
+    # Итоги по каждому пользователю. Записи дневника должны идти группами по пользователям
+    # в том же порядке, что и профили: так в памяти хранится только текущий пользователь
+    log = iter(log)
+    pending = next(log, None)
+    for profile in profiles:
+        user = str(profile["user"])
+        normal = normalCalories(parseSex(profile["sex"]), float(profile["age"]),
+                                float(profile["height"]), float(profile["weight"]))
+        totals = DayTotals()
+        while pending is not None and str(pending["user"]) == user:
+            totals.add(entryValues(pending, catalogue))
+            pending = next(log, None)
+        yield {"user": user, **balance(normal, totals)}
+    if pending is not None:
+        raise ValueError(f"записи дневника пользователя {pending['user']!r} не соответствуют порядку профилей")
+
+
+def writeRecords(records, stream, fmt: str) -> None:
+    # Построчная запись результатов в csv или jsonl
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(records)
+    else:
+        for record in records:
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетный расчёт нормы калорий и итогов дня")
+    parser.add_argument("--profiles", required=True,
+                        help="csv/jsonl с полями user, sex, age, height, weight")
+    parser.add_argument("--log", required=True,
+                        help="csv/jsonl с полями user и dish[, weight] или kcal, protein, fat, carbs; "
+                             "записи сгруппированы по пользователям в порядке профилей")
+    parser.add_argument("--catalogue", help="excel файл с базой данных блюд")
+    parser.add_argument("--output", default="-", help="файл результата (по умолчанию стандартный вывод)")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="формат результата (по умолчанию по расширению файла результата, иначе csv)")
+    args = parser.parse_args(argv)
+
+    catalogue = None
+    if args.catalogue:
+        # База данных нужна только для записей с названиями блюд
+        from database import Database
+        catalogue = Database(args.catalogue)
+
+    fmt = args.format or ("jsonl" if args.output.lower().endswith((".jsonl", ".json")) else "csv")
+    records = computeBalances(readRecords(args.profiles), readRecords(args.log), catalogue)
+    try:
+        if args.output == "-":
+            writeRecords(records, sys.stdout, fmt)
+        else:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                writeRecords(records, f, fmt)
+    except (OSError, KeyError, ValueError) as error:
+        print(f"ошибка: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
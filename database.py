@@ -0,0 +1,237 @@
+# Импортирование numpy для хранения состава блюд в виде типизированных массивов
+import numpy as np
+
+# Импортирование модулей для работы с файлами снимка базы данных и кеширования порций
+import functools
+import hashlib
+import json
+import os
+
+from instrumentation import timed
+
+
+'''
+Простая реализации базы данных для получения блюд из таблицы и хранения их в памяти.
+Данные хранятся по столбцам: список названий и по одному непрерывному массиву float64
+на каждую характеристику блюда (вес, ккал, белки, жиры, углеводы).
+'''
+class Database:
+    # Названия числовых столбцов в том порядке, в котором они идут в excel таблице
+    COLUMNS = ("weight", "kcal", "protein", "fat", "carbs")
+
+    # Версия формата снимка; при изменении формата старые снимки пересобираются
+    CACHE_VERSION = 1
+
+    # Сколько последних рассчитанных порций (блюдо, вес) хранится в кеше
+    PORTION_CACHE = 4096
+
+    # Метод инициализации (конструктор) класса, принимающий путь к файлу excelPath
+    @timed("Database.__init__")
+    def __init__(self, excelPath: str = None, cache: bool = True) -> None:
+        self.dishesNames = []  # Список для хранения названий блюд
+        self.index = {}  # Словарь "название блюда -> номер строки" для быстрого поиска
+        # Матрица состава блюд (строка - блюдо, столбец - характеристика).
+        # Хранится в порядке Fortran, поэтому каждый столбец лежит в памяти непрерывно
+        self.values = np.zeros((0, len(self.COLUMNS)), dtype=np.float64, order="F")
+        self.updatePerGram()
+
+        # Если рядом с excel файлом лежит актуальный снимок, читаем его вместо excel
+        if excelPath is not None and not (cache and self.loadCache(excelPath)):
+            # pandas нужен только для чтения excel файла
+            import pandas as pd
+            # Чтение данных из файла excelPath и заполнение столбцов за один проход
+            self.loadFrame(pd.read_excel(excelPath))
+            if cache:
+                self.saveCache(excelPath)
+        self.excelPath = excelPath
+
+    @classmethod
+    def fromFrame(cls, frame) -> "Database":
+        # Создание базы данных из уже прочитанной таблицы pandas (без чтения файла)
+        db = cls()
+        db.loadFrame(frame)
+        return db
+
+    @classmethod
+    def fromColumns(cls, names, values) -> "Database":
+        # Создание базы данных из готовых столбцов: названий и матрицы состава
+        db = cls()
+        db.setColumns(names, values)
+        return db
+
+    def loadFrame(self, frame) -> None:
+        import pandas as pd
+        # Первый столбец - названия блюд, следующие пять - их состав
+        frame = frame.dropna(subset=[frame.columns[0]])
+        names = frame.iloc[:, 0].astype(str).to_numpy()
+        # Нечисловые и пустые ячейки считаем нулями
+        values = frame.iloc[:, 1:1 + len(self.COLUMNS)].apply(pd.to_numeric, errors="coerce")
+        self.setColumns(names, values.fillna(0.0).to_numpy(dtype=np.float64))
+
+    def setColumns(self, names, values) -> None:
+        # Сопоставляем каждому названию номер его первого появления в таблице.
+        # Для повторяющихся названий сохраняется позиция первого вхождения,
+        # а состав берётся из последнего (как раньше при заполнении словаря)
+        index = {}
+        codes = np.empty(len(names), dtype=np.intp)
+        for i, name in enumerate(names):
+            codes[i] = index.setdefault(name, len(index))
+
+        # Номер строки последнего вхождения каждого названия: первое вхождение в перевёрнутом списке.
+        # Записывать все строки с повторяющимися номерами нельзя: numpy не гарантирует, какая из них останется
+        _, lastReversed = np.unique(codes[::-1], return_index=True)
+        last = len(codes) - 1 - lastReversed
+        self.values = np.zeros((len(index), len(self.COLUMNS)), dtype=np.float64, order="F")
+        self.values[:] = np.asarray(values, dtype=np.float64).reshape(-1, len(self.COLUMNS))[last]
+        self.index = index
+        self.dishesNames = list(index)
+        self.updatePerGram()
+
+    @staticmethod
+    def cachePath(excelPath: str) -> str:
+        # Снимок хранится в папке рядом с исходным файлом: "блюда.xlsx.cache"
+        return excelPath + ".cache"
+
+    @staticmethod
+    def fileHash(path: str) -> str:
+        # Хеш содержимого файла, чтобы не пересобирать снимок, если у файла изменилось только время
+        # Файл читается частями (hashlib.file_digest есть только с Python 3.11)
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def loadCache(self, excelPath: str) -> bool:
+        # Загрузка снимка базы данных; возвращает False, если снимка нет или он устарел
+        cacheDir = self.cachePath(excelPath)
+        try:
+            with open(os.path.join(cacheDir, "meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            stat = os.stat(excelPath)
+            if meta["version"] != self.CACHE_VERSION:
+                return False
+            if (meta["mtime"], meta["size"]) != (stat.st_mtime_ns, stat.st_size):
+                # Время или размер изменились - сверяем содержимое по хешу
+                if meta["size"] != stat.st_size or meta["hash"] != self.fileHash(excelPath):
+                    return False
+                # Содержимое прежнее, запоминаем новое время изменения
+                meta["mtime"] = stat.st_mtime_ns
+                self._writeJson(os.path.join(cacheDir, "meta.json"), meta)
+
+            # Матрица состава отображается в память без копирования
+            values = np.load(os.path.join(cacheDir, "values.npy"), mmap_mode="r")
+            with open(os.path.join(cacheDir, "names.bin"), "rb") as f:
+                blob = f.read()
+            # Названия хранятся одной строкой UTF-8, разделённой нулевыми символами;
+            # повреждённый файл названий (UnicodeDecodeError - это ValueError) означает пересборку снимка
+            names = blob.decode("utf-8").split("\0") if blob else []
+        except (OSError, ValueError, KeyError):
+            return False
+
+        if len(names) != values.shape[0] or values.shape[1:] != (len(self.COLUMNS),):
+            return False
+        self.values = values
+        self.dishesNames = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.updatePerGram()
+        return True
+
+    def saveCache(self, excelPath: str) -> None:
+        # Сохранение снимка базы данных рядом с исходным файлом
+        cacheDir = self.cachePath(excelPath)
+        try:
+            os.makedirs(cacheDir, exist_ok=True)
+            stat = os.stat(excelPath)
+            # Файлы пишутся во временные и подменяются целиком; meta.json - последним,
+            # поэтому прерванная запись не даст снимку совпасть с исходным файлом
+            tmp = os.path.join(cacheDir, "values.tmp.npy")
+            np.save(tmp, np.asfortranarray(self.values))
+            os.replace(tmp, os.path.join(cacheDir, "values.npy"))
+            tmp = os.path.join(cacheDir, "names.tmp")
+            with open(tmp, "wb") as f:
+                f.write("\0".join(self.dishesNames).encode("utf-8"))
+            os.replace(tmp, os.path.join(cacheDir, "names.bin"))
+            self._writeJson(os.path.join(cacheDir, "meta.json"), {
+                "version": self.CACHE_VERSION,
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": self.fileHash(excelPath),
+            })
+        except OSError:
+            pass  # Снимок - только ускорение; если записать его не удалось, работаем без него
+
+    @staticmethod
+    def _writeJson(path: str, data: dict) -> None:
+        # Атомарная запись json файла через временный файл
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+
+    def diff(self, other: "Database") -> tuple:
+        # Различия с новой версией базы данных: названия добавленных, удалённых и изменённых блюд
+        positions = np.fromiter((self.index.get(name, -1) for name in other.dishesNames),
+                                dtype=np.intp, count=len(other))
+        kept = positions >= 0
+        added = [other.dishesNames[i] for i in np.flatnonzero(~kept).tolist()]
+        removed = [name for name in self.dishesNames if name not in other.index]
+        differs = np.any(np.asarray(other.values)[kept] != np.asarray(self.values)[positions[kept]], axis=1)
+        changed = [other.dishesNames[i] for i in np.flatnonzero(kept)[differs].tolist()]
+        return added, removed, changed
+
+    def keepOrder(self, other: "Database") -> tuple:
+        # Блюда новой версии базы данных в порядке текущей: оставшиеся блюда сохраняют взаимный порядок,
+        # добавленные идут в конце. Возвращает базу данных и массив "старый номер блюда -> новый" (-1 - удалено)
+        names = [name for name in self.dishesNames if name in other.index]
+        names += [name for name in other.dishesNames if name not in self.index]
+        rows = np.fromiter((other.index[name] for name in names), dtype=np.intp, count=len(names))
+        db = Database.fromColumns(names, np.asarray(other.values)[rows])
+        db.excelPath = other.excelPath
+        mapping = np.fromiter((db.index.get(name, -1) for name in self.dishesNames), dtype=np.intp, count=len(self))
+        return db, mapping
+
+    def updatePerGram(self) -> None:
+        # Ккал, белки, жиры и углеводы на один грамм каждого блюда; считаются один раз при загрузке.
+        # У блюд с нулевым весом эталонной порции коэффициенты нулевые
+        weight = np.asarray(self.values[:, 0])
+        self.perGram = np.divide(self.values[:, 1:], weight[:, None], out=np.zeros((len(weight), len(self.COLUMNS) - 1)),
+                                 where=weight[:, None] != 0)
+        # Кеш порций привязан к составу блюд, поэтому создаётся заново вместе с коэффициентами
+        self.portion = functools.lru_cache(maxsize=self.PORTION_CACHE)(self.computePortion)
+
+    def computePortion(self, dishIndex: int, weight: float) -> tuple:
+        # Состав порции блюда заданного веса: вес, ккал, белки, жиры, углеводы
+        return (weight, *(self.perGram[dishIndex] * weight).tolist())
+
+    def __len__(self) -> int:
+        # Количество блюд в базе
+        return len(self.dishesNames)
+
+    def row(self, dishIndex: int) -> np.ndarray:
+        # Состав блюда по номеру строки: вес, ккал, белки, жиры, углеводы
+        return self.values[dishIndex]
+
+    def find(self, name: str) -> int:
+        # Номер строки блюда по названию (или -1, если блюда нет в базе)
+        return self.index.get(name, -1)
+
+    # Отдельные столбцы состава; каждый из них - непрерывный массив float64
+    @property
+    def weight(self) -> np.ndarray:
+        return self.values[:, 0]
+
+    @property
+    def kcal(self) -> np.ndarray:
+        return self.values[:, 1]
+
+    @property
+    def protein(self) -> np.ndarray:
+        return self.values[:, 2]
+
+    @property
+    def fat(self) -> np.ndarray:
+        return self.values[:, 3]
+
+    @property
+    def carbs(self) -> np.ndarray:
+        return self.values[:, 4]
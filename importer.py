@@ -0,0 +1,152 @@
+# Импорт базы данных блюд из нескольких excel файлов и листов.
+# Листы читаются параллельно в отдельных процессах и объединяются в одну базу данных без повторов:
+#   python importer.py блюда.xlsx супы.xlsx напитки.xlsx --prefer last
+
+# Импортирование модулей для запуска разбора листов в пуле процессов и замера времени
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Импортирование numpy для объединения составов блюд из разных листов
+import numpy as np
+
+from database import Database
+
+
+# Правила разрешения конфликтов, когда одно и то же блюдо с разным составом встречается в нескольких листах:
+# FIRST - сохраняется состав из первого по порядку листа, LAST - из последнего (как внутри одного листа)
+FIRST, LAST = "first", "last"
+
+
+def sheetNames(path: str) -> list:
+    # Названия листов книги в порядке их следования
+    import pandas as pd
+    with pd.ExcelFile(path) as book:
+        return list(book.sheet_names)
+
+
+def parseSheet(path: str, sheet) -> tuple:
+    # Разбор одного листа; выполняется в отдельном процессе.
+    # Возвращает названия блюд, матрицу их состава и время разбора в секундах
+    import pandas as pd
+    start = time.perf_counter()
+    frame = pd.read_excel(path, sheet_name=sheet)
+    # Пустой лист без заголовков пропускаем
+    db = Database.fromFrame(frame) if frame.shape[1] else Database()
+    return db.dishesNames, np.ascontiguousarray(db.values), time.perf_counter() - start
+
+
+def mergeColumns(parts, prefer: str = LAST) -> tuple:
+    # Объединение нескольких наборов (названия, состав) в одну базу данных.
+    # Порядок блюд - по первому появлению названия; состав повторяющихся блюд - по правилу prefer.
+    # Возвращает базу данных и список названий блюд, состав которых в разных наборах различался
+    if prefer not in (FIRST, LAST):
+        raise ValueError(f"неизвестное правило разрешения конфликтов: {prefer!r}")
+    names = [name for partNames, _ in parts for name in partNames]
+    values = [np.asarray(partValues, dtype=np.float64).reshape(-1, len(Database.COLUMNS)) for _, partValues in parts]
+    values = np.concatenate(values) if values else np.zeros((0, len(Database.COLUMNS)))
+
+    index = {}
+    codes = np.empty(len(names), dtype=np.intp)
+    for i, name in enumerate(names):
+        codes[i] = index.setdefault(name, len(index))
+
+    if prefer == LAST:
+        # Повторяющиеся названия: setColumns явно берёт состав из последнего вхождения
+        db = Database.fromColumns(names, values)
+    else:
+        # Оставляем только первое вхождение каждого названия
+        _, first = np.unique(codes, return_index=True)
+        db = Database.fromColumns([names[i] for i in first.tolist()], values[first])
+
+    # Конфликты - блюда, у которых хотя бы одно вхождение отличается от выбранного состава
+    differs = np.any(values != db.values[codes], axis=1)
+    conflicts = [db.dishesNames[code] for code in np.unique(codes[differs]).tolist()]
+    return db, conflicts
+
+
+def mergeDatabases(databases, prefer: str = LAST) -> tuple:
+    # Объединение уже загруженных баз данных по тем же правилам, что и при импорте
+    return mergeColumns([(db.dishesNames, db.values) for db in databases], prefer)
+
+
+'''
+Отчёт об импорте: время разбора и число блюд по каждому листу, конфликты при объединении
+'''
+class ImportReport:
+    # Сколько конфликтов выводится в отчёте поимённо
+    SHOWN_CONFLICTS = 20
+
+    def __init__(self) -> None:
+        self.sheets = []  # Кортежи (путь к файлу, лист, количество блюд, время разбора в секундах)
+        self.conflicts = []  # Названия блюд с разным составом в разных листах
+        self.total = 0.0  # Общее время импорта в секундах
+
+    def fileTimes(self) -> dict:
+        # Суммарное время разбора каждого файла
+        times = {}
+        for path, _, _, seconds in self.sheets:
+            times[path] = times.get(path, 0.0) + seconds
+        return times
+
+    def format(self) -> str:
+        # Отчёт в виде текстовой таблицы: самые медленные листы первыми
+        lines = [f"{'время, с':>9} {'блюд':>8}  файл / лист"]
+        for path, sheet, rows, seconds in sorted(self.sheets, key=lambda item: -item[3]):
+            lines.append(f"{seconds:9.3f} {rows:8}  {path} / {sheet}")
+        for path, seconds in sorted(self.fileTimes().items(), key=lambda item: -item[1]):
+            lines.append(f"{seconds:9.3f} {'':8}  {path} (все листы)")
+        lines.append(f"всего: {self.total:.3f} с, конфликтов: {len(self.conflicts)}")
+        lines.extend(f"  конфликт: {name}" for name in self.conflicts[:self.SHOWN_CONFLICTS])
+        if len(self.conflicts) > self.SHOWN_CONFLICTS:
+            lines.append(f"  ... и ещё {len(self.conflicts) - self.SHOWN_CONFLICTS}")
+        return "\n".join(lines)
+
+
+def importCatalogue(paths, workers: int = None, prefer: str = LAST) -> tuple:
+    # Импорт базы данных из всех листов всех файлов paths.
+    # Листы объединяются в порядке файлов и листов внутри файла; возвращает базу данных и отчёт
+    start = time.perf_counter()
+    tasks = [(path, sheet) for path in paths for sheet in sheetNames(path)]
+    if workers is None:
+        workers = min(len(tasks), os.cpu_count() or 1)
+
+    if workers > 1:
+        # Процессы запускаются заново (spawn), а не копируются из текущего (fork): импорт вызывается
+        # и из фонового потока приложения, а копия многопоточного процесса Qt может зависнуть
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(parseSheet, *zip(*tasks)))
+    else:
+        # Один лист или один процесс - разбираем без запуска пула
+        results = [parseSheet(path, sheet) for path, sheet in tasks]
+
+    report = ImportReport()
+    report.sheets = [(path, sheet, len(names), seconds) for (path, sheet), (names, _, seconds) in zip(tasks, results)]
+    db, report.conflicts = mergeColumns([(names, values) for names, values, _ in results], prefer)
+    report.total = time.perf_counter() - start
+    return db, report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Импорт базы данных блюд из нескольких excel файлов")
+    parser.add_argument("paths", nargs="+", help="excel файлы с блюдами (все листы)")
+    parser.add_argument("--workers", type=int, help="число процессов (по умолчанию по числу листов и ядер)")
+    parser.add_argument("--prefer", choices=[FIRST, LAST], default=LAST,
+                        help="чей состав оставлять для блюда, которое есть в нескольких листах")
+    args = parser.parse_args(argv)
+
+    try:
+        db, report = importCatalogue(args.paths, args.workers, args.prefer)
+    except (OSError, ValueError) as error:
+        print(f"ошибка: {error}", file=sys.stderr)
+        return 1
+    print(report.format())
+    print(f"блюд в базе: {len(db)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
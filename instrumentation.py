@@ -0,0 +1,145 @@
+# Замер времени работы медленных мест приложения: гистограммы задержек по каждому слоту и функции
+# и число виджетов. Включается переменной окружения CALORIES_INSTRUMENT=путь.json или ключом
+# --instrument[=путь.json]; при выходе из приложения результаты записываются в json файл.
+# Если замер выключен, декоратор timed возвращает функцию без изменений и ничего не замедляет
+
+# Импортирование модулей для замера времени, записи результатов и регистрации действий при выходе
+import atexit
+import bisect
+import functools
+import inspect
+import json
+import os
+import sys
+import time
+
+
+# Границы корзин гистограммы задержек в миллисекундах: от 10 мкс до ~10 с, каждая следующая
+# в 2^(1/4) раза больше предыдущей (погрешность перцентилей - не больше 19%); последняя корзина - всё, что дольше
+BUCKETS = tuple(round(0.01 * 2 ** (i / 4), 4) for i in range(81))
+
+
+def outputPath():
+    # Путь к json файлу с результатами или None, если замер выключен
+    for arg in sys.argv[1:]:
+        if arg == "--instrument":
+            return "instrumentation.json"
+        if arg.startswith("--instrument="):
+            return arg.split("=", 1)[1]
+    return os.environ.get("CALORIES_INSTRUMENT") or None
+
+
+'''
+Гистограмма задержек одного места: число вызовов, суммарное, наименьшее и наибольшее время
+и число вызовов в каждой корзине BUCKETS
+'''
+class Histogram:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0  # мс
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKETS, ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        # Оценка перцентиля сверху: граница корзины, в которую он попадает
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+    def toDict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "mean_ms": round(self.total / self.count, 4) if self.count else 0.0,
+            "min_ms": round(self.min, 4) if self.count else 0.0,
+            "max_ms": round(self.max, 4),
+            "p50_ms": round(self.percentile(0.5), 4),
+            "p95_ms": round(self.percentile(0.95), 4),
+            "buckets_ms": {f"<={bound:g}": count for bound, count in zip(BUCKETS, self.buckets) if count},
+            "slower_ms": self.buckets[-1],
+        }
+
+
+path = outputPath()  # Куда записать результаты (None - замер выключен)
+enabled = path is not None
+histograms = {}  # Гистограммы по названиям мест
+widgets = {"samples": 0, "last": 0, "max": 0}  # Число виджетов приложения
+
+
+def timed(name: str):
+    # Декоратор замера времени вызова функции или слота под названием name
+    def decorator(function):
+        if not enabled:
+            return function
+        histogram = histograms.setdefault(name, Histogram())
+        # Qt передаёт слоту столько аргументов сигнала, сколько слот принимает, а обёртка с *args
+        # принимает любое число; лишние аргументы (например, текст из textEdited) отбрасываются здесь
+        code = function.__code__
+        limit = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args[:limit], **kwargs)
+            finally:
+                histogram.add((time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def sampleWidgets() -> None:
+    # Запоминаем текущее и наибольшее число виджетов приложения (если приложение Qt запущено)
+    if "PySide6.QtWidgets" not in sys.modules:
+        return
+    from PySide6.QtWidgets import QApplication
+    if QApplication.instance() is None:
+        return
+    count = len(QApplication.allWidgets())
+    widgets["samples"] += 1
+    widgets["last"] = count
+    widgets["max"] = max(widgets["max"], count)
+
+
+def watchWidgets(parent, interval: int = 1000):
+    # Периодический подсчёт виджетов, пока существует parent; возвращает таймер (или None, если замер выключен)
+    if not enabled:
+        return None
+    from PySide6.QtCore import QTimer
+    timer = QTimer(parent, interval=interval)
+    timer.timeout.connect(sampleWidgets)
+    timer.start()
+    return timer
+
+
+def report() -> dict:
+    # Результаты замера в виде словаря для json
+    return {
+        "histograms": {name: histogram.toDict() for name, histogram in sorted(histograms.items()) if histogram.count},
+        "widgets": dict(widgets),
+    }
+
+
+def dump(target: str = None) -> None:
+    # Запись результатов в json файл
+    if not enabled:
+        return
+    sampleWidgets()
+    with open(target or path, "w", encoding="utf-8") as f:
+        json.dump(report(), f, ensure_ascii=False, indent=2)
+
+
+if enabled:
+    atexit.register(dump)
@@ -0,0 +1,132 @@
+# Дневник питания на диске: каждое изменение строки дневника дописывается в конец журнала SQLite,
+# а суммы за каждый день обновляются в той же транзакции, поэтому итоги за неделю или месяц
+# считаются по дневным суммам без повторного просмотра записей
+
+# Импортирование модулей для работы с базой данных SQLite и датами
+import datetime
+import sqlite3
+
+from calculator import COLUMNS
+from instrumentation import timed
+
+
+# Виды записей журнала: добавление или изменение строки дневника и её удаление
+SET, REMOVE = 0, 1
+
+
+def dayNumber(day: datetime.date) -> int:
+    # Номер дня, которым дни хранятся в журнале
+    return day.toordinal()
+
+
+'''
+Журнал дневника питания.
+Записи только добавляются: изменение строки - новая запись с её составом, удаление - запись-отметка.
+У каждой строки дневника есть постоянный номер (entry), по которому записи одной строки связываются между собой
+'''
+class Journal:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        try:
+            # WAL: запись в конец файла журнала без блокировки чтения; fsync только при контрольных точках
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            columns = ", ".join(f"{name} REAL NOT NULL" for name in COLUMNS)
+            self.connection.executescript(f"""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    day INTEGER NOT NULL,
+                    entry INTEGER NOT NULL,
+                    kind INTEGER NOT NULL,
+                    dish TEXT,
+                    {columns}
+                );
+                CREATE INDEX IF NOT EXISTS entries_day ON entries (day);
+                CREATE TABLE IF NOT EXISTS daily (
+                    day INTEGER PRIMARY KEY,
+                    {columns}
+                );
+            """)
+            # Проверка, что в журнал можно писать: существующий файл только для чтения открывается без ошибок
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("ROLLBACK")
+        except sqlite3.Error:
+            # Журнал не открылся (например, папка только для чтения) - не оставляем соединение открытым
+            self.connection.close()
+            raise
+        # Следующий свободный номер строки дневника
+        self.nextEntry = self.connection.execute("SELECT COALESCE(MAX(entry), 0) + 1 FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def newEntry(self) -> int:
+        # Постоянный номер для новой строки дневника
+        entry = self.nextEntry
+        self.nextEntry += 1
+        return entry
+
+    @timed("Journal.append")
+    def append(self, day: datetime.date, entry: int, kind: int, dish, values, delta) -> None:
+        # Запись в журнал и изменение суммы за день на delta в одной транзакции
+        number = dayNumber(day)
+        with self.connection:
+            self.connection.execute(
+                f"INSERT INTO entries (day, entry, kind, dish, {', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (number, entry, kind, dish, *map(float, values)))
+            self.connection.execute(
+                f"INSERT INTO daily (day, {', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT(day) DO UPDATE SET {', '.join(f'{name} = {name} + excluded.{name}' for name in COLUMNS)}",
+                (number, *map(float, delta)))
+
+    # Изменения строк дневника - те же, что и у итогов дня (DayTotals): добавление, замена и удаление
+    def add(self, day: datetime.date, entry: int, dish: str, values) -> None:
+        self.append(day, entry, SET, dish, values, values)
+
+    def replace(self, day: datetime.date, entry: int, dish: str, old, new) -> None:
+        self.append(day, entry, SET, dish, new, [float(value) - float(prev) for value, prev in zip(new, old)])
+
+    def remove(self, day: datetime.date, entry: int, old) -> None:
+        self.append(day, entry, REMOVE, None, [0.0] * len(COLUMNS), [-float(value) for value in old])
+
+    def day(self, day: datetime.date) -> list:
+        # Строки дневника за день в порядке добавления: (номер строки, название блюда, состав).
+        # Записи дня читаются по индексу и проигрываются по порядку: берётся последнее состояние строки
+        rows = {}
+        for entry, kind, dish, *values in self.connection.execute(
+                f"SELECT entry, kind, dish, {', '.join(COLUMNS)} FROM entries WHERE day = ? ORDER BY id",
+                (dayNumber(day),)):
+            if kind == REMOVE:
+                rows.pop(entry, None)
+            else:
+                # Изменённая строка остаётся на своём месте в порядке добавления
+                rows[entry] = (entry, dish, values)
+        return list(rows.values())
+
+    def daily(self, first: datetime.date, last: datetime.date) -> list:
+        # Суммы по дням с first по last включительно: (дата, [вес, ккал, белки, жиры, углеводы])
+        return [(datetime.date.fromordinal(day), values) for day, *values in self.connection.execute(
+            f"SELECT day, {', '.join(COLUMNS)} FROM daily WHERE day BETWEEN ? AND ? ORDER BY day",
+            (dayNumber(first), dayNumber(last)))]
+
+    def total(self, first: datetime.date, last: datetime.date) -> list:
+        # Суммы за период с first по last включительно
+        row = self.connection.execute(
+            f"SELECT {', '.join(f'COALESCE(SUM({name}), 0)' for name in COLUMNS)} FROM daily WHERE day BETWEEN ? AND ?",
+            (dayNumber(first), dayNumber(last))).fetchone()
+        return list(row)
+
+    def periods(self, first: datetime.date, last: datetime.date, period: str = "week") -> list:
+        # Суммы по неделям (с понедельника) или по месяцам: (первый день периода, суммы, число дней с записями)
+        result = {}
+        for day, values in self.daily(first, last):
+            if period == "week":
+                start = day - datetime.timedelta(days=day.weekday())
+            elif period == "month":
+                start = day.replace(day=1)
+            else:
+                raise ValueError(f"неизвестный период: {period!r}")
+            sums, days = result.get(start, ([0.0] * len(COLUMNS), 0))
+            result[start] = ([total + value for total, value in zip(sums, values)], days + 1)
+        return [(start, sums, days) for start, (sums, days) in result.items()]
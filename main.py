@@ -1,17 +1,35 @@
+# Время запуска для режима --profile-startup: отсчёт начинается до импорта остальных модулей
+import time
+startTime = time.perf_counter()
+
 # Импортирование необходимых модулей из библиотеки PySide6 для разработки графического интерфейса
-from PySide6.QtGui import QIcon, QRegularExpressionValidator
+from PySide6.QtGui import QFont, QIcon, QRegularExpressionValidator, QStandardItem, QStandardItemModel
 from PySide6 import QtCore, QtWidgets
 from PySide6.QtCore import Qt
 
-# Импортирование функции apply_stylesheet из модуля qt_material для применения пользовательских стилей к графическому интерфейсу
-from qt_material import apply_stylesheet
+# Импортирование функции применения стилевой темы (qt_material импортируется ею только при сборке темы)
+from theme import applyTheme
+
+# Импортирование numpy для хранения дневника питания в числовых массивах
+import numpy as np
 
-# Импортирование библиотеки pandas для манипулирования и анализа данных
-import pandas as pd
+# Импортирование модуля datetime для определения текущего дня дневника
+import datetime
+
+# Импортирование расчёта нормы калорий и итогов дня, базы данных блюд и индекса для поиска по ней
+from calculator import DayTotals, macroNorms, normalCalories, portion
+from database import Database
+from journal import Journal
+from planner import planMeals
+import instrumentation
+from instrumentation import timed
+from search import DishSearchIndex
 
 # Импортирование модулей sys и os для взаимодействия с операционной системой
 import sys
 import os
+# Импортирование sqlite3 для обработки ошибок открытия журнала
+import sqlite3
 
 
 basedir = os.path.dirname(__file__)  # Получаем путь к директории, где находится исполняемый файл скрипта
@@ -27,7 +45,18 @@ except ImportError:
 Главный класс приложения, в котором формируется весь интерфейс и логика работы
 '''
 class MyApp(QtWidgets.QWidget):
-    def __init__(self):
+    # Сигнал о том, что база данных блюд загружена и приложением можно пользоваться
+    catalogueLoaded = QtCore.Signal()
+    # Сигнал о том, что изменения файлов базы данных применены
+    catalogueReloaded = QtCore.Signal()
+
+    # Пауза после изменения файла базы данных перед его чтением, мс
+    RELOAD_DELAY = 500
+    # При большем числе удалённых и добавленных блюд список блюд заменяется целиком, а не по строкам:
+    # удаление каждой строки сдвигает весь список, и на больших базах это дольше полной замены
+    MAX_ROW_CHANGES = 32
+
+    def __init__(self, db: Database = None, excelPath: str = "блюда.xlsx", journal: Journal = None):
         super().__init__()
 
         # Устанавливаем заголовок окна
@@ -69,41 +98,94 @@ class MyApp(QtWidgets.QWidget):
         self.weight.textEdited.connect(self.updateNormalAndNeededCalories)
         self.weight.setPlaceholderText("70 (кг)")
 
+        # Инициализируем базу данных. Если она не передана, окно создаётся с пустой базой,
+        # а excel таблица читается в фоновом потоке, чтобы окно появилось сразу
+        self.db = Database() if db is None else db
+        # Общая модель списка блюд, которую используют редакторы блюда во всех строках таблицы
+        self.dishModel = DishListModel(self.db, self)
+        # Индекс для поиска блюд по названию при наборе текста в редакторе блюда
+        self.searchIndex = DishSearchIndex(self.db.dishesNames)
+        # Модель дневника питания: состав съеденных блюд хранится в числовых массивах, а не в виджетах
+        # Если передан журнал, все изменения дневника записываются в него, а дневник за сегодня восстанавливается
+        self.log = FoodLogModel(self.db, self, journal)
+        self.log.totalsChanged.connect(self.updateResults)
+
         # Создаем и настраиваем таблицу для отображения данных о продуктах
-        self.table = QtWidgets.QTableWidget(minimumHeight=256)
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(["Продукт", "Вес, г", "Ккал", "Белки", "Жиры", "Углеводы", "X"])
-        self.table.setItemDelegate(AlignDelegate())
-        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-        self.table.currentCellChanged.connect(self.changeSelectedData)
+        self.table = QtWidgets.QTableView(minimumHeight=256)
+        self.table.setModel(self.log)
+        # Делегат создаёт редактор только для ячейки, которую сейчас редактируют
+        self.delegate = FoodLogDelegate(self.dishModel, self.searchIndex, self.table)
+        self.table.setItemDelegate(self.delegate)
+        # Кнопки удаления рисует отдельный делегат столбца "X", а текст остальных ячеек рисует Qt
+        # без вызовов Python при каждой перерисовке
+        self.removeDelegate = RemoveButtonDelegate(self.table)
+        self.removeDelegate.removeClicked.connect(self.removeRow)
+        self.table.setItemDelegateForColumn(FoodLogModel.REMOVE, self.removeDelegate)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.AllEditTriggers)
+        self.table.verticalHeader().setDefaultSectionSize(32)
         
         # Настраиваем размеры столбцов таблицы
         header = self.table.horizontalHeader()
-        for i in range(self.table.columnCount() - 1):
+        for i in range(self.log.columnCount() - 1):
             header.setSectionResizeMode(i, QtWidgets.QHeaderView.Stretch)
         header.setSectionResizeMode(6, QtWidgets.QHeaderView.ResizeToContents)   
 
         # Создаем и настраиваем виджеты для отображения нормы калорий, употребленных калорий и необходимых калорий
         self.normalLabel = QtWidgets.QLabel("Ваша норма", objectName="boldedOrangeText")
         self.normalValue = QtWidgets.QLabel("0 ккал", objectName="boldedBlackText")
+        self.normal = 0.0  # Норма калорий числом, чтобы не разбирать текст надписи
 
         self.eatedLabel = QtWidgets.QLabel("Вы употребили", objectName="boldedOrangeText")
         self.eatedValue = QtWidgets.QLabel("0 ккал", objectName="boldedBlackText")
 
         self.neededLabel = QtWidgets.QLabel("Ещё необходимо", objectName="boldedOrangeText")
         self.neededValue = QtWidgets.QLabel("0 ккал", objectName="boldedBlackText")
-
-        # Инициализируем базу данных (считываем поля из excel таблицы для загрузки данных в память и последующей работы с ними)
-        self.db = Database("блюда.xlsx")
+        # Кнопка подбора блюд на оставшуюся часть нормы
+        self.suggestBtn = QtWidgets.QPushButton("Что ещё съесть?")
+        self.suggestBtn.clicked.connect(self.suggestMeals)
+
+        # Поле с путём к дополнительному excel файлу с блюдами и кнопка выбора файла
+        self.readFileName = QtWidgets.QLineEdit(placeholderText="Дополнительный файл с блюдами (.xlsx, .xls)")
+        self.readFileName.returnPressed.connect(self.check_path)
+        self.openFileBtn = QtWidgets.QPushButton("Открыть")
+        self.openFileBtn.clicked.connect(self.open_file)
+        self.readFiles = []  # Файлы, блюда из которых добавлены к базе данных
+        self.worker = None  # Фоновая загрузка базы данных, если она идёт
+        self.pendingFile = None  # Файл, который сейчас добавляется к базе данных
+
+        # Слежение за файлами базы данных: после их изменения база данных перечитывается в фоновом потоке,
+        # а в моделях обновляются только добавленные, удалённые и изменённые блюда
+        self.excelPath = excelPath if db is None else db.excelPath
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.catalogueFileChanged)
+        # Редакторы сохраняют файл в несколько приёмов, поэтому перечитываем его после паузы
+        self.reloadTimer = QtCore.QTimer(self, singleShot=True, interval=self.RELOAD_DELAY)
+        self.reloadTimer.timeout.connect(self.reloadCatalogue)
+        # В полночь дневник переходит на новый день, даже если окно не закрывали
+        self.dayTimer = QtCore.QTimer(self, singleShot=True)
+        self.dayTimer.timeout.connect(self.newDay)
+        self.startDayTimer()
 
         # Вызываем методы для настройки интерфейса
         self.setupUi()
         self.loadCss()
         self.addAppendBtn()
-        self.addResults()
+
+        if db is None:
+            # Пока база данных не загружена, добавлять блюда и файлы нельзя
+            self.setCatalogueEnabled(False)
+            self.startWorker(self.setCatalogue, loadCatalogue, excelPath)
+        else:
+            self.log.restoreDay()
+            self.watchFiles()
 
 
+    @timed("MyApp.loadCss")
     def loadCss(self):
+        # Если тема уже применена ко всему приложению, style.css входит в её таблицу стилей,
+        # и второй раз разбирать его не нужно
+        if QtWidgets.QApplication.instance().styleSheet():
+            return
         # Открываем файл style.css, используя его путь, объединенный с путем каталога basedir, в режиме чтения (оператор "r")
         with open(os.path.join(basedir, "style.css"), "r") as f:
             # Считываем содержимое файла в переменную _style
@@ -127,11 +209,13 @@ class MyApp(QtWidgets.QWidget):
         radioBtnLayout.addWidget(self.womenGender)
         self.layout.addLayout(radioBtnLayout, 0, 1, 1, 2)
 
-        # Создаем вертикальный отступ
-        verticalSpacer = QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        # Функция создания вертикального отступа. Сетка удаляет свои элементы вместе с собой,
+        # поэтому один и тот же отступ нельзя добавлять в неё несколько раз
+        def verticalSpacer():
+            return QtWidgets.QSpacerItem(20, 10, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
 
         # Добавляем вертикальный отступ на вторую строку сетки для разделения содержимого
-        self.layout.addItem(verticalSpacer, 1, 0, 1, 3)
+        self.layout.addItem(verticalSpacer(), 1, 0, 1, 3)
 
         # Создаем вертикальный слой для возраста
         ageLayout = QtWidgets.QVBoxLayout()
@@ -153,13 +237,13 @@ class MyApp(QtWidgets.QWidget):
         self.layout.addLayout(weightLayout, 2, 2, 1, 1)  # Добавляем на третью строку сетки
 
         # Добавляем вертикальный отступ на четвертую строку сетки
-        self.layout.addItem(verticalSpacer, 3, 0, 1, 3)
+        self.layout.addItem(verticalSpacer(), 3, 0, 1, 3)
 
         # Добавляем таблицу на пятую строку сетки
         self.layout.addWidget(self.table, 4, 0, 1, 3)
 
         # Добавляем вертикальный отступ на шестую строку сетки
-        self.layout.addItem(verticalSpacer, 5, 0, 1, 3)
+        self.layout.addItem(verticalSpacer(), 5, 0, 1, 3)
 
         # Создаем вертикальный слой для отображения нормы
         normalLayout = QtWidgets.QVBoxLayout()
@@ -177,154 +261,174 @@ class MyApp(QtWidgets.QWidget):
         neededLayout = QtWidgets.QVBoxLayout()
         neededLayout.addWidget(self.neededLabel, alignment=Qt.AlignCenter)
         neededLayout.addWidget(self.neededValue, alignment=Qt.AlignCenter)
+        neededLayout.addWidget(self.suggestBtn, alignment=Qt.AlignCenter)
         self.layout.addLayout(neededLayout, 6, 2, 1, 1)  # Добавляем на седьмую строку сетки
 
         # Добавляем вертикальный отступ на восьмую строку сетки
-        self.layout.addItem(verticalSpacer, 7, 0, 1, 3)
+        self.layout.addItem(verticalSpacer(), 7, 0, 1, 3)
+
+        # Добавляем поле и кнопку для дополнительного файла с блюдами на девятую строку сетки
+        fileLayout = QtWidgets.QHBoxLayout()
+        fileLayout.addWidget(self.readFileName)
+        fileLayout.addWidget(self.openFileBtn)
+        self.layout.addLayout(fileLayout, 8, 0, 1, 3)
 
     
     @QtCore.Slot() # декоратор нужен для того, чтобы иметь возможность вызвать функцию при нажатии на кнопку в интерфейсе
+    @timed("MyApp.addItem")
     def addItem(self):
-        # Получаем номер строки для вставки нового элемента
-        row = self.table.rowCount() - 2
-        # Вставляем новую строку в таблицу
-        self.table.insertRow(row)
-
-        # Создаем и настраиваем комбо-бокс для выбора блюда
-        comboBox = QtWidgets.QComboBox()
-        comboBox.addItems(self.db.dishesNames)
-        comboBox.currentIndexChanged.connect(self.updateRow)
-        self.table.setCellWidget(row, 0, comboBox)
-
-        # Получаем данные о первом блюде из базы данных
-        dataRow = self.db.dishes[self.db.dishesNames[0]]
-        # Создаем и настраиваем поле для ввода веса
-        weight = QtWidgets.QLineEdit(str(dataRow[0]), alignment=Qt.AlignCenter)
-        validator = QRegularExpressionValidator(QtCore.QRegularExpression("[0-9.]{10}"))
-        weight.setValidator(validator)
-        weight.textEdited.connect(self.updateResults)
-        self.table.setCellWidget(row, 1, weight)
-
-        # Заполняем ячейки таблицы данными о блюде
-        for column in range(2, self.table.columnCount() - 1):
-            self.table.setItem(row, column, QtWidgets.QTableWidgetItem(str(dataRow[column - 1])))
-
-        # Создаем и настраиваем кнопку удаления строки
-        removeBtn = QtWidgets.QPushButton("X")
-        removeBtn.clicked.connect(self.removeRow)
-        self.table.setCellWidget(row, 6, removeBtn)
-
-        # Вызываем функцию обновления результатов
-        self.updateResults()
+        # Добавляем в дневник первое блюдо из базы данных; итоги обновятся по сигналу модели
+        row = self.log.appendEntry(0)
+        # Прокручиваем таблицу к новой строке. Редактор блюда не открывается сразу: создание комбо-бокса
+        # со всем списком блюд заметно замедляло добавление, а открывается он одним щелчком по ячейке
+        self.table.scrollTo(self.log.index(row, 0))
 
 
     def addAppendBtn(self):
         # Функция для добавления кнопки "Добавить" в таблицу
-        row = self.table.rowCount()  # Получаем текущее количество строк в таблице
-        self.table.insertRow(row)  # Вставляем новую строку в таблицу
-        addBtn = QtWidgets.QPushButton(" + ", objectName="addBtn")  # Создаем кнопку " + "
-        addBtn.clicked.connect(self.addItem)  # Привязываем к кнопке метод добавления элемента
-        self.table.setCellWidget(row, 3, addBtn)  # Устанавливаем кнопку в ячейку таблицы
-
-    def addResults(self):
-        # Функция для добавления текстового поля с результатом в таблицу
-        row = self.table.rowCount()  # Получаем текущее количество строк в таблице
-        self.table.insertRow(row)  # Вставляем новую строку в таблицу
-        res = QtWidgets.QLabel("Итог: ", objectName="resultText")  # Создаем текстовое поле с надписью "Итог: "
-        self.table.setCellWidget(row, 0, res)  # Устанавливаем текстовое поле в ячейку таблицы
+        self.addBtn = QtWidgets.QPushButton(" + ", objectName="addBtn")  # Создаем кнопку " + "
+        self.addBtn.clicked.connect(self.addItem)  # Привязываем к кнопке метод добавления элемента
+        # Устанавливаем кнопку в ячейку строки с кнопкой; при добавлении строк она сдвигается вместе со строкой
+        self.table.setIndexWidget(self.log.index(self.log.buttonRow(), 3), self.addBtn)
 
-    @QtCore.Slot()
-    def changeSelectedData(self, *args):
-        # Слот для обработки изменения выделенных данных в таблице
-        self.curRow = args[0]  # Устанавливаем текущую строку
-        self.curCol = args[1]  # Устанавливаем текущий столбец
-        self.prewRow = args[2]  # Устанавливаем предыдущую строку
-        self.prewCol = args[3]  # Устанавливаем предыдущий столбец
+    def startDayTimer(self):
+        # Таймер до начала следующих суток (с запасом в секунду)
+        now = datetime.datetime.now()
+        midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+        self.dayTimer.start(int((midnight - now).total_seconds() * 1000) + 1000)
 
+    @QtCore.Slot()
+    def newDay(self):
+        # Наступил новый день: дневник заменяется записями нового дня из журнала
+        self.log.setDay(datetime.date.today())
+        self.startDayTimer()
+
+    def setCatalogueEnabled(self, enabled):
+        # Включение и выключение элементов, которым нужна база данных блюд
+        self.addBtn.setEnabled(enabled)
+        self.suggestBtn.setEnabled(enabled)
+        self.readFileName.setEnabled(enabled)
+        self.openFileBtn.setEnabled(enabled)
+
+    def startWorker(self, slot, function, *args):
+        # Запуск загрузки базы данных в фоновом потоке; результат придёт в slot
+        self.worker = Worker(function, *args)
+        self.worker.signals.finished.connect(slot)
+        self.worker.signals.failed.connect(self.catalogueFailed)
+        QtCore.QThreadPool.globalInstance().start(self.worker)
+
+    def watchFiles(self):
+        # Следим за основным файлом базы данных и добавленными файлами
+        paths = [path for path in [self.excelPath] + self.readFiles if path and os.path.isfile(path)]
+        missing = [path for path in paths if path not in self.watcher.files()]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    @QtCore.Slot(str)
+    def catalogueFileChanged(self, path):
+        # Файл изменён: откладываем чтение, пока редактор не закончит сохранение
+        self.reloadTimer.start()
 
     @QtCore.Slot()
-    def updateRow(self, dishIndex):
-        # Создаем комбо-бокс
-        comboBox = QtWidgets.QComboBox()
-        # Добавляем элементы из базы данных в комбо-бокс
-        comboBox.addItems(self.db.dishesNames)
-        # Устанавливаем текущий индекс выбранного блюда
-        comboBox.setCurrentIndex(dishIndex)
-        # Привязываем сигнал изменения индекса к слоту обновления строки
-        comboBox.currentIndexChanged.connect(self.updateRow)
-        # Устанавливаем комбо-бокс в таблицу в указанную ячейку
-        self.table.setCellWidget(self.curRow, 0, comboBox)
-
-        # Получаем данные о блюде из базы данных
-        dataRow = self.db.dishes[self.db.dishesNames[dishIndex]]
-        # Создаем поле веса и заполняем данными из базы данных
-        weight = QtWidgets.QLineEdit(str(dataRow[0]), alignment=Qt.AlignCenter)
-        # Привязываем сигнал завершения редактирования к обновлению результатов
-        weight.editingFinished.connect(self.updateResults)
-        # Устанавливаем поле веса в таблицу в указанную ячейку
-        self.table.setCellWidget(self.curRow, 1, weight)
-
-        # Заполняем остальные ячейки таблицы данными о блюде
-        for column in range(2, self.table.columnCount() - 1):
-            self.table.setItem(self.curRow, column, QtWidgets.QTableWidgetItem(str(dataRow[column-1])))
-
-        # Создаем кнопку удаления строки
-        removeBtn = QtWidgets.QPushButton("X")
-        # Привязываем сигнал нажатия кнопки к методу удаления строки
-        removeBtn.clicked.connect(self.removeRow)
-        # Устанавливаем кнопку удаления в таблицу в указанную ячейку
-        self.table.setCellWidget(self.curRow, 6, removeBtn)
-        # Обновляем результаты
-        self.updateResults()
-
-    @QtCore.Slot()    
-    def removeRow(self):
-        # Удаляем текущую строку из таблицы
-        self.table.removeRow(self.curRow)
-        # Обновляем результаты
-        self.updateResults()
+    def reloadCatalogue(self):
+        if self.worker is not None:
+            # Идёт другая загрузка - повторим после неё
+            self.reloadTimer.start()
+            return
+        # Файл могли заменить новым (сохранение через временный файл) - следим за ним заново
+        self.watchFiles()
+        if self.excelPath and os.path.isfile(self.excelPath):
+            self.startWorker(self.applyCatalogueChanges, reloadCatalogue, self.db, self.excelPath, list(self.readFiles))
+
+    @QtCore.Slot(object)
+    @timed("MyApp.applyCatalogueChanges")
+    def applyCatalogueChanges(self, result):
+        # Применение изменений базы данных без перестроения таблицы: из списка блюд удаляются и в него
+        # добавляются только изменившиеся строки, а в дневнике обновляются строки с изменёнными блюдами
+        db, self.searchIndex, mapping, added, removed, changed = result
+        self.worker = None
+        old = self.db
+        self.db = db
+        if len(added) + len(removed) > self.MAX_ROW_CHANGES:
+            self.dishModel.setStringList(db.dishesNames)
+        else:
+            # Удаляем строки удалённых блюд с конца, чтобы номера ещё не удалённых строк не сдвигались
+            for row in np.flatnonzero(mapping < 0)[::-1].tolist():
+                self.dishModel.removeRows(row, 1)
+            start = self.dishModel.rowCount()
+            self.dishModel.insertRows(start, len(added))
+            for i, name in enumerate(added):
+                self.dishModel.setData(self.dishModel.index(start + i), name)
+        self.delegate.searchIndex = self.searchIndex
+        self.log.updateDishes(db, mapping, [db.find(name) for name in changed], old)
+        self.catalogueReloaded.emit()
+
+    @QtCore.Slot(object)
+    @timed("MyApp.setCatalogue")
+    def setCatalogue(self, result):
+        # База данных и индекс поиска готовы: подключаем их к моделям и включаем элементы интерфейса
+        self.db, self.searchIndex, report = result
+        self.worker = None
+        if report:
+            # Время разбора листов и блюда с разным составом показываем в подсказке поля
+            self.readFileName.setToolTip(report)
+        self.dishModel.setStringList(self.db.dishesNames)
+        self.delegate.searchIndex = self.searchIndex
+        self.log.db = self.db
+        if not self.log.restored:
+            # Строки дневника ссылаются на блюда базы данных, поэтому восстанавливаем его после её загрузки
+            self.log.restoreDay()
+        self.watchFiles()
+        self.setCatalogueEnabled(True)
+        self.catalogueLoaded.emit()
+
+    @QtCore.Slot(object)
+    def applyMergedFile(self, result):
+        # Блюда файла добавлены к базе данных. Изменения применяются так же, как при перечитывании
+        # изменённых файлов: состав блюд, которые есть в новом файле, берётся из него, поэтому
+        # строки дневника с этими блюдами пересчитываются для своего веса
+        *changes, report = result
+        self.readFiles.append(self.pendingFile)
+        self.pendingFile = None
+        # Время разбора листов и блюда с разным составом показываем в подсказке поля
+        self.readFileName.setToolTip(report)
+        self.applyCatalogueChanges(changes)
+        self.watchFiles()
+        self.readFileName.setEnabled(True)
+        self.openFileBtn.setEnabled(True)
+
+    @QtCore.Slot(str)
+    def catalogueFailed(self, message):
+        # Базу данных загрузить не удалось: сообщаем об ошибке, элементы остаются в прежнем состоянии
+        self.worker = None
+        self.pendingFile = None
+        self.readFileName.setEnabled(True)
+        self.openFileBtn.setEnabled(True)
+        QtWidgets.QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить базу данных блюд:\n{message}")
+
+    def closeEvent(self, event):
+        # Вес, который набирался в редакторе при закрытии окна, тоже записываем в журнал
+        self.log.flushPending()
+        super().closeEvent(event)
+
+    @QtCore.Slot(int)
+    @timed("MyApp.removeRow")
+    def removeRow(self, row):
+        # Удаляем строку из дневника; итоги обновятся по сигналу модели
+        self.log.removeEntry(row)
 
 
     @QtCore.Slot()
+    @timed("MyApp.updateResults")
     def updateResults(self):
-        # Обновление результатов
-        resultsRow = self.table.rowCount() - 1
-        # Нахождение номера строки для вывода результатов
-
-        for column in range(1, self.table.columnCount()-1):
-            # Перебор всех столбцов с данными (кроме первого и последнего)
-            columnSum = self.getSumOfColum(column)
-            # Вычисление суммы значений в столбце
-            if column == 2: self.eatedValue.setText(f"{columnSum:.0f} ккал") 
-            # Если столбец равен 2, обновляем значение в соответствующем виджете
-            self.table.setItem(resultsRow, column, QtWidgets.QTableWidgetItem(f"{columnSum:.2f}"))
-            # Устанавливаем значение суммы в таблицу
-
-        self.neededValue.setText(f"{int(self.normalValue.text()[:-5]) - int(self.eatedValue.text()[:-5])} ккал")
+        # Обновление результатов: итоги дня уже посчитаны моделью, остаётся только вывести их
+        self.eatedValue.setText(f"{self.log.totals.kcal:.0f} ккал")
         # Вычисляем и устанавливаем разницу между нормой и употребленными калориями
-
-    def getSumOfColum(self, columIndex) -> int:
-        # Функция для вычисления суммы значений в столбце
-        columnSum = 0
-        try:
-            # Попытка найти значения в ячейках таблицы
-            for row in range(self.table.rowCount() - 2):
-                item = self.table.item(row, columIndex)
-                # Получаем элемент из таблицы
-                columnSum += float(item.text() if item.text() != '' else 0)
-                # Суммируем значения, преобразуя их в числовой формат
-        except AttributeError:
-            # Обработка ошибки, если элемент не найден
-            for row in range(self.table.rowCount() - 2):
-                item = self.table.cellWidget(row, columIndex)
-                # Получаем виджет из таблицы
-                columnSum += float(item.text() if item.text() != '' else 0)
-                # Суммируем значения виджетов, преобразуя их в числовой формат
-        return columnSum
-        # Возвращаем сумму значений в столбце
+        self.neededValue.setText(f"{self.normal - self.log.totals.kcal:.0f} ккал")
 
     # Обновление нормы и необходимых калорий в зависимости от введенных параметров
     @QtCore.Slot()
+    @timed("MyApp.updateNormalAndNeededCalories")
     def updateNormalAndNeededCalories(self):
         try:
             # Получаем возраст, рост и вес из введенных значений
@@ -335,15 +439,40 @@ class MyApp(QtWidgets.QWidget):
             return  # Прерываем выполнение функции в случае возникновения исключения
 
         # Вычисление нормы калорий в зависимости от пола
-        if self.menGender.isChecked():
-            self.normalValue.setText(f"{9.99 * weight + 6.25 * height - 4.92 * age + 5:.0f} ккал")
-        elif self.womenGender.isChecked():
-            self.normalValue.setText(f"{9.99 * weight + 6.25 * height - 4.92 * age - 161:.0f} ккал")
-        else:
-            print('error')  # Выводим сообщение об ошибке, если пол не выбран корректно
+        self.normal = normalCalories(self.menGender.isChecked(), age, height, weight)
+        self.normalValue.setText(f"{self.normal:.0f} ккал")
 
         # Вычисление необходимых калорий для достижения нормы
-        self.neededValue.setText(f"{int(self.normalValue.text()[:-5]) - int(self.eatedValue.text()[:-5])} ккал")
+        self.neededValue.setText(f"{self.normal - self.log.totals.kcal:.0f} ккал")
+
+    # Подбор блюд, которые закрывают остаток нормы калорий, белков, жиров и углеводов
+    @QtCore.Slot()
+    @timed("MyApp.suggestMeals")
+    def suggestMeals(self):
+        if self.normal <= 0:
+            QtWidgets.QMessageBox.information(self, "Подбор блюд", "Сначала введите возраст, рост и вес.")
+            return
+        remaining = np.array((self.normal,) + macroNorms(self.normal)) - self.log.totals.sums[1:]
+        # Блюда, которые уже есть в дневнике, не предлагаем
+        eaten = self.log.dishes[:self.log.count]
+        plan = planMeals(self.db, remaining, exclude=eaten[eaten >= 0])
+        if not len(plan):
+            QtWidgets.QMessageBox.information(self, "Подбор блюд", "Норма калорий на сегодня уже набрана.")
+            return
+
+        lines = [f"{self.db.dishesNames[dish]} — {weight:g} г ({self.db.portion(dish, weight)[1]:.0f} ккал)"
+                 for dish, weight in plan.items()]
+        lines.append("")
+        lines.append(f"Итого: {plan.achieved[0]:.0f} из {remaining[0]:.0f} ккал, белки {plan.achieved[1]:.0f} г, "
+                     f"жиры {plan.achieved[2]:.0f} г, углеводы {plan.achieved[3]:.0f} г")
+        if not plan.within:
+            lines.append("Точно попасть в норму по белкам, жирам и углеводам не удалось.")
+        lines.append("")
+        lines.append("Добавить эти блюда в дневник?")
+        answer = QtWidgets.QMessageBox.question(self, "Подбор блюд", "\n".join(lines))
+        if answer == QtWidgets.QMessageBox.StandardButton.Yes:
+            for dish, weight in plan.items():
+                self.log.setWeight(self.log.appendEntry(dish), weight)
 
     # Проверка пути к файлу и добавление его к списку для чтения
     @QtCore.Slot()
@@ -351,9 +480,17 @@ class MyApp(QtWidgets.QWidget):
         path = self.readFileName.text()
         # Проверяем, является ли указанный путь файлом и имеет ли расширение .xlsx или .xls
         if os.path.isfile(path) and path.split(".")[-1] in ("xlsx", "xls"):
-            self.add_read_file(path)  # Добавляем файл к списку для чтения
-            self.update_tree_widget(self.get_complete_dict())  # Обновляем виджет с данными из файла
-            self.tree.itemChanged.connect(self.check_all)  # Подключаем функцию check_all к событию изменения элемента
+            self.add_read_file(path)  # Добавляем блюда из файла к базе данных
+
+    # Добавление блюд из всех листов excel файла к базе данных
+    def add_read_file(self, path):
+        if path in self.readFiles or self.worker is not None:
+            return
+        self.pendingFile = path
+        # Файл читается в фоновом потоке; пока он читается, другой файл добавить нельзя
+        self.readFileName.setEnabled(False)
+        self.openFileBtn.setEnabled(False)
+        self.startWorker(self.applyMergedFile, mergeCatalogue, self.db, path)
 
     # Открытие файла через диалоговое окно
     @QtCore.Slot()
@@ -365,56 +502,574 @@ class MyApp(QtWidgets.QWidget):
             self.readFileName.setText(path[0])  # Устанавливаем путь к файлу в соответствующее поле
             self.check_path()  # Проверяем путь и обрабатываем файл
 
+def openJournal(locations):
+    # Журнал дневника в первой папке из locations, где его удалось открыть. Папка приложения может быть
+    # только для чтения (установка в Program Files), поэтому следующей идёт папка данных пользователя;
+    # если журнал не открылся нигде, дневник ведётся без журнала
+    for location in locations:
+        try:
+            os.makedirs(location, exist_ok=True)
+            return Journal(os.path.join(location, "дневник.sqlite"))
+        except (OSError, sqlite3.Error):
+            continue
+    return None
+
+
+def loadCatalogue(excelPath):
+    # Чтение базы данных и построение индекса поиска; выполняется в фоновом потоке
+    db = Database(excelPath)
+    return db, DishSearchIndex(db.dishesNames), None
+
+
+def mergeCatalogue(db, path):
+    # Добавление блюд из всех листов файла path к базе данных db; выполняется в фоновом потоке.
+    # Состав блюд, которые есть в обоих файлах, берётся из нового файла; изменения возвращаются
+    # в том же виде, что и при перечитывании файлов (reloadCatalogue), и отчёт об импорте
+    # Импортер нужен только при добавлении файлов, поэтому импортируется при первом обращении
+    from importer import importCatalogue, mergeDatabases
+    extra, report = importCatalogue([path])
+    merged, report.conflicts = mergeDatabases([db, extra])
+    added, removed, changed = db.diff(merged)
+    merged, mapping = db.keepOrder(merged)
+    return merged, DishSearchIndex(merged.dishesNames), mapping, added, removed, changed, report.format()
+
+
+def reloadCatalogue(old, excelPath, readFiles):
+    # Повторное чтение изменённых файлов базы данных; выполняется в фоновом потоке.
+    # Блюда новой версии выстраиваются в порядке текущей базы, чтобы номера оставшихся блюд
+    # в списке блюд и в дневнике сдвинулись только на число удалённых перед ними
+    new = Database(excelPath)
+    if readFiles:
+        from importer import importCatalogue, mergeDatabases
+        extra, _ = importCatalogue(readFiles)
+        new, _ = mergeDatabases([new, extra])
+    added, removed, changed = old.diff(new)
+    db, mapping = old.keepOrder(new)
+    return db, DishSearchIndex(db.dishesNames), mapping, added, removed, changed
+
+'''
+Сигналы фоновой задачи. QRunnable не является QObject и не может объявлять сигналы сам
+'''
+class WorkerSignals(QtCore.QObject):
+    finished = QtCore.Signal(object)  # Результат задачи
+    failed = QtCore.Signal(str)  # Текст ошибки
+
+'''
+Фоновая задача для пула потоков: вызывает функцию и передаёт результат в поток интерфейса через сигналы
+'''
+class Worker(QtCore.QRunnable):
+    def __init__(self, function, *args):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.function(*self.args)
+        except Exception as error:
+            self.signals.failed.emit(str(error))
+            return
+        self.signals.finished.emit(result)
+
+'''
+Модель списка названий блюд базы данных (названия копируются в модель при загрузке базы данных).
+Одна модель используется всеми комбо-боксами таблицы, поэтому названия не копируются в каждую строку.
+Названия хранятся на стороне Qt (QStringListModel), так как комбо-бокс при показе многократно
+обращается к модели, и вызовы методов модели на Python на больших списках заметно тормозят
+'''
+class DishListModel(QtCore.QStringListModel):
+    def __init__(self, db: Database, parent=None):
+        super().__init__(db.dishesNames, parent)
+
 '''
-Определение пользовательского делегата AlignDelegate, который является подклассом QItemDelegate
-Просто чтобы ячейки в таблице были отцентрованы
+Подсказки при наборе названия блюда.
+Список подсказок заполняется результатами поиска по индексу, а не фильтрацией всего списка блюд
 '''
-class AlignDelegate(QtWidgets.QItemDelegate):
-    # Переопределение метода paint для кастомной отрисовки элементов делегата
+class DishCompleter(QtWidgets.QCompleter):
+    def __init__(self, searchIndex: DishSearchIndex, parent=None):
+        super().__init__(parent)
+        self.searchIndex = searchIndex
+        self.results = QtCore.QStringListModel(self)
+        self.setModel(self.results)
+        # Подсказки показываются как есть, без дополнительной фильтрации по набранному тексту
+        self.setCompletionMode(QtWidgets.QCompleter.UnfilteredPopupCompletion)
+
+    @QtCore.Slot(str)
+    @timed("DishCompleter.search")
+    def search(self, text):
+        # Обновляем подсказки для набранного текста и показываем их
+        rows = self.searchIndex.search(text, self.maxVisibleItems())
+        self.results.setStringList([self.searchIndex.names[row] for row in rows])
+        if rows:
+            self.complete()
+        else:
+            self.popup().hide()
+
+'''
+Модель дневника питания для таблицы.
+Строки дневника хранятся в компактных массивах: номер блюда в базе и его состав (вес, ккал, белки, жиры, углеводы).
+Таблице модель отдаёт готовые тексты ячеек, которые хранятся на стороне Qt (QStandardItemModel) и обновляются
+только при изменении строки: при перерисовке таблица запрашивает у модели каждую ячейку по нескольку раз,
+и вызовы методов модели на Python делали дневник на модели медленнее таблицы с виджетами.
+После строк дневника идут строка с кнопкой " + " и строка итогов.
+Если задан журнал, каждое изменение строки дописывается в него вместе с постоянным номером строки
+'''
+class FoodLogModel(QStandardItemModel):
+    # Сигнал об изменении итогов дня
+    totalsChanged = QtCore.Signal()
+
+    HEADERS = ["Продукт", "Вес, г", "Ккал", "Белки", "Жиры", "Углеводы", "X"]
+    # Столбцы таблицы
+    DISH, WEIGHT, REMOVE = 0, 1, 6
+    # Текст всех ячеек по центру
+    CENTER = Qt.AlignmentFlag.AlignCenter
+    # Флаги ячеек: редактировать можно только блюдо и вес в строках дневника
+    EDITABLE = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+    STATIC = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+    def __init__(self, db: Database, parent=None, journal: Journal = None):
+        super().__init__(0, len(self.HEADERS), parent)
+        self.setHorizontalHeaderLabels(self.HEADERS)
+        self.db = db
+        self.journal = journal  # Журнал дневника на диске (или None)
+        self.day = datetime.date.today()  # День, за который ведётся дневник
+        self.restored = False  # Восстановлен ли дневник за день из журнала
+        self.count = 0  # Количество строк дневника
+        # Массивы с запасом: при добавлении строк они увеличиваются вдвое, а не на одну строку
+        self.dishes = np.zeros(16, dtype=np.int32)
+        self.entries = np.zeros(16, dtype=np.int64)  # Постоянные номера строк (те же, что в журнале)
+        self.nextEntry = 1  # Следующий номер строки, если журнала нет
+        # Блюда, которых больше нет в базе данных, по номерам строк: название и ккал, белки, жиры и углеводы
+        # на грамм, по которым пересчитывается вес строки; у таких строк номер блюда -1
+        self.orphans = {}
+        self.values = np.zeros((16, DayTotals.SIZE), dtype=np.float64)
+        self.totals = DayTotals()  # Итоги дня
+        # Строки, вес которых изменён в редакторе, но ещё не записан в журнал: состав строки,
+        # который сейчас записан в журнале, по номерам строк. Вес записывается при закрытии редактора,
+        # а не при каждом нажатии клавиши
+        self.pending = {}
+        # Строка с кнопкой " + " и строка итогов с жирной надписью "Итог: "
+        self.appendRow(self.makeItems([""] * len(self.HEADERS)))
+        self.appendRow(self.makeItems(self.formatTotals()))
+        boldFont = QFont()
+        boldFont.setBold(True)
+        self.item(self.totalsRow(), self.DISH).setFont(boldFont)
+
+    # Номер строки с кнопкой " + "
+    def buttonRow(self) -> int:
+        return self.count
+
+    # Номер строки итогов
+    def totalsRow(self) -> int:
+        return self.count + 1
+
+    def makeItems(self, texts, editable: bool = False) -> list:
+        # Ячейки строки таблицы с текстами texts
+        items = []
+        for column, text in enumerate(texts):
+            item = QStandardItem(text)
+            item.setTextAlignment(self.CENTER)
+            item.setFlags(self.EDITABLE if editable and column in (self.DISH, self.WEIGHT) else self.STATIC)
+            items.append(item)
+        return items
+
+    def formatRow(self, row: int) -> list:
+        # Тексты ячеек строки дневника: название блюда, его состав и кнопка удаления
+        return [self.dishName(row), *(f"{value:g}" for value in self.values[row].tolist()), "X"]
+
+    def formatTotals(self) -> list:
+        # Тексты ячеек строки итогов: суммы по столбцам дневника
+        return ["Итог: ", *(f"{total:.2f}" for total in self.totals.sums), ""]
+
+    def setTexts(self, row: int, texts: list, first: int = 0) -> None:
+        # Обновление текстов ячеек строки, начиная со столбца first (кнопку удаления не трогаем)
+        for column in range(first, self.REMOVE):
+            self.item(row, column).setText(texts[column])
+
+    def insertEntry(self, row: int) -> None:
+        # Вставка в таблицу строки дневника, данные которой уже записаны в массивы
+        self.insertRow(row, self.makeItems(self.formatRow(row), editable=True))
+        self.count += 1
+
+    def editValue(self, index):
+        # Значение ячейки для редактора: номер блюда или вес числом
+        if index.column() == self.DISH:
+            return int(self.dishes[index.row()])
+        return float(self.values[index.row(), 0])
+
+    def setData(self, index, value, role=Qt.EditRole):
+        # Изменения из редакторов таблицы; тексты ячеек модель обновляет сама
+        if role != Qt.EditRole or index.row() >= self.count:
+            return False
+        if index.column() == self.DISH:
+            self.setDish(index.row(), int(value))
+        elif index.column() == self.WEIGHT:
+            self.setWeight(index.row(), float(value))
+        else:
+            return False
+        return True
+
+    @timed("FoodLogModel.appendEntry")
+    def appendEntry(self, dishIndex: int) -> int:
+        # Добавление блюда в конец дневника; возвращает номер новой строки.
+        # Если день сменился, а таймер полуночи ещё не сработал (например, после сна компьютера),
+        # сначала переходим на новый день, чтобы блюдо не записалось во вчерашний дневник
+        self.setDay(datetime.date.today())
+        row = self.count
+        self.reserve(row + 1)
+        self.dishes[row] = dishIndex
+        self.values[row] = self.db.row(dishIndex)
+        self.entries[row] = self.newEntry()
+        self.insertEntry(row)
+        self.totals.add(self.values[row])
+        if self.journal:
+            self.journal.add(self.day, int(self.entries[row]), self.dishName(row), self.values[row])
+        self.totalsUpdated()
+        return row
+
+    def reserve(self, count: int) -> None:
+        # Массивы заполнены - увеличиваем их вдвое
+        if count > len(self.dishes):
+            size = max(count, 2 * len(self.dishes))
+            self.dishes = np.resize(self.dishes, size)
+            self.entries = np.resize(self.entries, size)
+            self.values = np.resize(self.values, (size, DayTotals.SIZE))
+
+    def newEntry(self) -> int:
+        # Постоянный номер новой строки
+        if self.journal:
+            return self.journal.newEntry()
+        self.nextEntry += 1
+        return self.nextEntry - 1
+
+    def dishName(self, row: int) -> str:
+        dishIndex = self.dishes[row]
+        return self.db.dishesNames[dishIndex] if dishIndex >= 0 else self.orphans[int(self.entries[row])][0]
+
+    def setDay(self, day: datetime.date) -> None:
+        # Переход на другой день; если дневник уже восстановлен, он заменяется записями этого дня
+        if day == self.day:
+            return
+        self.flushPending()
+        self.day = day
+        if self.restored:
+            self.restoreDay()
+
+    @timed("FoodLogModel.restoreDay")
+    def restoreDay(self) -> None:
+        # Восстановление дневника за день из журнала (без журнала дневник просто очищается).
+        # Строки с блюдами, которых больше нет в базе данных, восстанавливаются с сохранённым составом
+        self.restored = True
+        self.pending.clear()
+        rows = self.journal.day(self.day) if self.journal else []
+        # Строки удаляются и вставляются, а не сбрасывается вся модель: при сбросе таблица удалила бы
+        # виджеты в ячейках, в том числе кнопку " + "
+        if self.count:
+            self.removeRows(0, self.count)
+            self.count = 0
+            self.orphans.clear()
+        self.totals.reset()
+        self.reserve(len(rows))
+        for row, (entry, dish, values) in enumerate(rows):
+            self.entries[row] = entry
+            self.dishes[row] = self.db.find(dish)
+            if self.dishes[row] < 0:
+                # Коэффициенты на грамм восстанавливаются по сохранённому составу строки
+                self.orphans[entry] = (dish, np.array(portion(values, 1.0)[1:]))
+            self.values[row] = values
+            self.insertEntry(row)
+            self.totals.add(values)
+        self.totalsUpdated()
+
+    @timed("FoodLogModel.setDish")
+    def setDish(self, row: int, dishIndex: int) -> None:
+        # Замена блюда в строке: состав строки берётся из базы данных
+        old = self.values[row].copy()
+        self.orphans.pop(int(self.entries[row]), None)
+        self.dishes[row] = dishIndex
+        self.values[row] = self.db.row(dishIndex)
+        self.totals.replace(old, self.values[row])
+        if self.journal:
+            self.journal.replace(self.day, int(self.entries[row]), self.dishName(row), self.journaled(row, old),
+                                 self.values[row])
+        self.setTexts(row, self.formatRow(row))
+        self.totalsUpdated()
+
+    @timed("FoodLogModel.setWeight")
+    def setWeight(self, row: int, weight: float, journal: bool = True) -> None:
+        # Изменение веса в строке: ккал, белки, жиры и углеводы пересчитываются по коэффициентам
+        # на грамм из базы данных, а итоги изменяются на разницу.
+        # journal=False - вес ещё набирается в редакторе: в журнал он запишется в flushPending
+        old = self.values[row].copy()
+        dishIndex = int(self.dishes[row])
+        if dishIndex >= 0:
+            self.values[row] = self.db.portion(dishIndex, weight)
+        else:
+            # Блюда уже нет в базе данных - пересчитываем по коэффициентам, сохранённым при его удалении
+            # (не по текущему составу строки: после веса 0 из него уже не восстановить состав на грамм)
+            perGram = self.orphans[int(self.entries[row])][1]
+            self.values[row] = (weight, *(perGram * weight).tolist())
+        self.totals.replace(old, self.values[row])
+        if self.journal and journal:
+            self.journal.replace(self.day, int(self.entries[row]), self.dishName(row), self.journaled(row, old),
+                                 self.values[row])
+        elif self.journal:
+            self.pending.setdefault(int(self.entries[row]), old)
+        self.setTexts(row, self.formatRow(row), self.WEIGHT)
+        self.totalsUpdated()
+
+    @timed("FoodLogModel.updateDishes")
+    def updateDishes(self, db: Database, mapping: np.ndarray, changed: list, oldDb: Database) -> None:
+        # Переход на новую версию базы данных. mapping - новые номера блюд по старым (-1 - блюдо удалено),
+        # changed - новые номера блюд с изменённым составом. Строки с удалёнными блюдами сохраняют прежний
+        # состав и коэффициенты на грамм из прежней базы данных oldDb, а у строк с изменёнными блюдами
+        # состав пересчитывается для их веса
+        self.db = db
+        dishes = self.dishes[:self.count]
+        known = np.flatnonzero(dishes >= 0)
+        for row in known[mapping[dishes[known]] < 0].tolist():
+            self.orphans[int(self.entries[row])] = (oldDb.dishesNames[dishes[row]], oldDb.perGram[dishes[row]].copy())
+        dishes[known] = mapping[dishes[known]]
+
+        rows = np.flatnonzero(np.isin(dishes, changed)).tolist() if changed else []
+        for row in rows:
+            old = self.values[row].copy()
+            self.values[row] = db.portion(int(dishes[row]), float(old[0]))
+            self.totals.replace(old, self.values[row])
+            if self.journal:
+                self.journal.replace(self.day, int(self.entries[row]), self.dishName(row), self.journaled(row, old),
+                                     self.values[row])
+            self.setTexts(row, self.formatRow(row), self.WEIGHT)
+        if rows:
+            self.totalsUpdated()
+
+    def journaled(self, row: int, old) -> np.ndarray:
+        # Состав строки, записанный в журнале (от него считается изменение итогов дня в журнале):
+        # прежний состав old или, если вес строки ещё не записан из редактора, состав до начала его набора
+        return self.pending.pop(int(self.entries[row]), old)
+
+    def flushPending(self) -> None:
+        # Запись в журнал весов, набранных в редакторе, - по одной записи на строку
+        for entry, old in self.pending.items():
+            row = int(np.flatnonzero(self.entries[:self.count] == entry)[0])
+            if not np.array_equal(old, self.values[row]):
+                self.journal.replace(self.day, entry, self.dishName(row), old, self.values[row])
+        self.pending.clear()
+
+    @timed("FoodLogModel.removeEntry")
+    def removeEntry(self, row: int) -> None:
+        # Удаление строки из дневника: строки после неё сдвигаются на одну вверх
+        old = self.values[row].copy()
+        if self.journal:
+            self.journal.remove(self.day, int(self.entries[row]), self.journaled(row, old))
+        self.orphans.pop(int(self.entries[row]), None)
+        self.dishes[row:self.count - 1] = self.dishes[row + 1:self.count]
+        self.entries[row:self.count - 1] = self.entries[row + 1:self.count]
+        self.values[row:self.count - 1] = self.values[row + 1:self.count]
+        self.count -= 1
+        self.removeRow(row)
+        if self.count:
+            self.totals.subtract(old)
+        else:
+            self.totals.reset()
+        self.totalsUpdated()
+
+    def totalsUpdated(self) -> None:
+        # Обновляем тексты строки итогов и сообщаем об изменении итогов
+        self.setTexts(self.totalsRow(), self.formatTotals(), self.WEIGHT)
+        self.totalsChanged.emit()
+
+'''
+Делегат столбца удаления: в строках дневника рисует кнопку "X" вместо отдельного виджета-кнопки
+в каждой строке и сообщает о нажатии на неё
+'''
+class RemoveButtonDelegate(QtWidgets.QItemDelegate):
+    # Сигнал о нажатии кнопки удаления в строке
+    removeClicked = QtCore.Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pressedRow = None  # Строка, на кнопке удаления которой нажата левая кнопка мыши
+
     def paint(self, painter, option, index):
-        # Установка горизонтального выравнивания текста в ячейке по центру
-        option.displayAlignment = QtCore.Qt.AlignCenter
-        # Вызов родительского метода paint для отображения содержимого элемента делегата
-        QtWidgets.QItemDelegate.paint(self, painter, option, index)
+        if index.row() < index.model().count:
+            button = QtWidgets.QStyleOptionButton()
+            button.rect = option.rect
+            button.text = "X"
+            button.state = option.state | QtWidgets.QStyle.StateFlag.State_Enabled
+            style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+            style.drawControl(QtWidgets.QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+            return
+        super().paint(painter, option, index)
+
+    def editorEvent(self, event, model, option, index):
+        # Как у настоящей кнопки, строка удаляется, только если левая кнопка мыши нажата и отпущена
+        # на одной и той же кнопке (не правый щелчок и не перетаскивание)
+        onButton = index.row() < model.count
+        if event.type() == QtCore.QEvent.Type.MouseButtonPress:
+            self.pressedRow = index.row() if onButton and event.button() == Qt.LeftButton else None
+            if onButton:
+                return True
+        elif event.type() == QtCore.QEvent.Type.MouseButtonRelease and onButton:
+            pressedRow, self.pressedRow = self.pressedRow, None
+            if event.button() == Qt.LeftButton and pressedRow == index.row():
+                self.removeClicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
 
 '''
-Простая реализации базы данных для получения блюд из таблицы и хранения их в памяти.
+Делегат таблицы дневника: создаёт виджет-редактор только для ячейки, которую сейчас редактируют.
+Текст ячеек рисует сам Qt (выравнивание по центру задаёт модель)
 '''
-class Database:
-    # Инициализация атрибутов dishes и dishesNames
-    dishes = {}  # Словарь для хранения блюд и их состава
-    dishesNames = []  # Список для хранения названий блюд
-
-    # Метод инициализации (конструктор) класса, принимающий путь к файлу excelPath
-    def __init__(self, excelPath: str) -> None:
-        # Чтение данных из файла excelPath и сохранение их в переменную sheet
-        sheet = pd.read_excel(excelPath)
-        
-        # Перебор строк (индексов) в таблице данных
-        for i in sheet.index:
-            # Добавление в словарь dishes новой записи в виде пары ключ-значение,
-            # где ключ - название блюда, значение - состав блюда (в виде списка)
-            self.dishes.update({sheet.values[i][0]: sheet.values[i][1:]})
-        
-        # Получение ключей (названий блюд) из словаря dishes и сохранение их в списке dishesNames
-        self.dishesNames = list(self.dishes.keys())
+class FoodLogDelegate(QtWidgets.QItemDelegate):
+    def __init__(self, dishModel: DishListModel, searchIndex: DishSearchIndex, parent=None):
+        super().__init__(parent)
+        self.dishModel = dishModel
+        self.searchIndex = searchIndex
+
+    def createEditor(self, parent, option, index):
+        if index.column() == FoodLogModel.DISH:
+            # Комбо-бокс для выбора блюда (список блюд общий для всех строк)
+            comboBox = QtWidgets.QComboBox(parent)
+            comboBox.setModel(self.dishModel)
+            # Размеры комбо-бокса и строк его списка не подбираются по всем названиям,
+            # иначе при показе редактора перебирается весь список блюд
+            comboBox.setSizeAdjustPolicy(QtWidgets.QComboBox.AdjustToMinimumContentsLengthWithIcon)
+            comboBox.view().setUniformItemSizes(True)
+            # Название можно набрать с клавиатуры: подсказки берутся из индекса поиска
+            comboBox.setEditable(True)
+            comboBox.setInsertPolicy(QtWidgets.QComboBox.NoInsert)
+            completer = DishCompleter(self.searchIndex, comboBox)
+            comboBox.setCompleter(completer)
+            comboBox.lineEdit().textEdited.connect(completer.search)
+            # Выбранное блюдо сразу записывается в модель
+            comboBox.activated.connect(lambda: self.commitData.emit(comboBox))
+            return comboBox
+        if index.column() == FoodLogModel.WEIGHT:
+            # Поле для ввода веса
+            weight = QtWidgets.QLineEdit(parent, alignment=Qt.AlignCenter)
+            # Не больше одной точки, иначе незавершённый текст вроде "1.." не разберётся в число
+            weight.setValidator(QRegularExpressionValidator(QtCore.QRegularExpression(r"[0-9]{0,7}(\.[0-9]{0,2})?")))
+            # Итоги обновляются при каждом изменении веса
+            weight.textEdited.connect(lambda: self.commitData.emit(weight))
+            return weight
+        return None
+
+    def setEditorData(self, editor, index):
+        value = index.model().editValue(index)
+        if index.column() == FoodLogModel.DISH:
+            editor.setCurrentIndex(value)
+        elif self.parseWeight(editor.text()) != value:
+            # Текст редактора переписывается, только если вес изменился не из этого редактора,
+            # иначе при наборе пропадали бы незавершённые значения вроде "12."
+            editor.setText(f"{value:g}")
+
+    @staticmethod
+    def parseWeight(text: str) -> float:
+        # Вес из текста поля ввода; пустое поле считается нулём
+        return float(text) if text not in ("", ".") else 0.0
+
+    def setModelData(self, editor, model, index):
+        if index.column() == FoodLogModel.DISH:
+            # После замены списка блюд в редакторе может не остаться выбранного блюда.
+            # Редактор закрывается и при простом переходе по ячейкам: если блюдо не изменилось,
+            # строку не трогаем, иначе введённый вес сбросился бы на вес порции из базы данных
+            dishIndex = editor.currentIndex()
+            if dishIndex >= 0 and dishIndex != model.editValue(index):
+                model.setData(index, dishIndex)
+        else:
+            # Итоги обновляются при каждом нажатии клавиши, а в журнал вес запишется при закрытии редактора
+            model.setWeight(index.row(), self.parseWeight(editor.text()), journal=False)
+
+    def destroyEditor(self, editor, index):
+        # Редактор веса закрыт: набранный вес записывается в журнал одной записью
+        if index.column() == FoodLogModel.WEIGHT:
+            index.model().flushPending()
+        super().destroyEditor(editor, index)
+
+
+'''
+Замер времени запуска по этапам для режима --profile-startup.
+Этапы отмечаются по порядку; первая отрисовка окна и окончание загрузки базы данных
+отмечаются по событиям, после чего отчёт печатается и приложение закрывается
+'''
+class StartupProfile(QtCore.QObject):
+    def __init__(self, start: float):
+        super().__init__()
+        self.start = start  # Время начала запуска
+        self.last = start  # Время предыдущей отметки
+        self.phases = []  # Пары (название этапа, длительность в секундах)
+        self.painted = False
+        self.loaded = False
+
+    def mark(self, name: str) -> None:
+        # Отметка окончания этапа
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def watch(self, window: MyApp) -> None:
+        # Ожидание первой отрисовки окна и окончания загрузки базы данных
+        window.installEventFilter(self)
+        window.catalogueLoaded.connect(self.catalogueLoaded)
+        self.loaded = window.worker is None
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Type.Paint and not self.painted:
+            self.painted = True
+            self.mark("первая отрисовка")
+            self.finish()
+        return False
+
+    @QtCore.Slot()
+    def catalogueLoaded(self):
+        self.loaded = True
+        self.mark("загрузка базы данных")
+        self.finish()
+
+    def finish(self) -> None:
+        # Печать отчёта, когда окно отрисовано и готово к работе
+        if not (self.painted and self.loaded):
+            return
+        print(f"{'этап':<24} {'мс':>8} {'с начала, мс':>14}")
+        total = 0.0
+        for name, seconds in self.phases:
+            total += seconds
+            print(f"{name:<24} {seconds * 1000:8.1f} {total * 1000:14.1f}")
+        QtCore.QTimer.singleShot(0, QtWidgets.QApplication.quit)
 
 
 # Если данный скрипт запускается как основной (а не, например, импортируется из другого скрипта),
 # то выполняется следующий блок кода
 if __name__ == "__main__":
     # Создаем экземпляр приложения QtWidgets.QApplication([])
+    # Режим --profile-startup печатает длительность этапов запуска и закрывает приложение
+    profile = StartupProfile(startTime) if "--profile-startup" in sys.argv else None
+    if profile:
+        profile.mark("импорт модулей")
     application = QtWidgets.QApplication([])
-    
-    # Создаем экземпляр класса MyApp
-    MyApp = MyApp()
-    
+    if profile:
+        profile.mark("QApplication")
+
+    # Применяем стилевую тему 'light_orange.xml' вместе со style.css до создания окна,
+    # чтобы виджеты получили стили один раз, а не пересчитывали их после показа окна
+    applyTheme(application)
+    if profile:
+        profile.mark("тема")
+
+    # Создаем экземпляр класса MyApp; дневник питания хранится в журнале рядом с приложением
+    # или в папке данных пользователя
+    journal = openJournal([basedir, QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.AppDataLocation)])
+    MyApp = MyApp(journal=journal)
+    if profile:
+        profile.mark("создание окна")
+        profile.watch(MyApp)
+    # При включённом замере (--instrument) раз в секунду считаем виджеты приложения
+    widgetTimer = instrumentation.watchWidgets(MyApp)
+
     # Показываем приложение, чтобы пользователь мог видеть его интерфейс
     MyApp.show()
-    
-    # Применяем стилевую тему с помощью функции apply_stylesheet,
-    # передавая в нее приложение и название темы 'light_orange.xml'
-    apply_stylesheet(application, theme='light_orange.xml')
-    
+
     # Выходим из цикла выполнения приложения и завершаем программу с кодом возврата application.exec()
     sys.exit(application.exec())
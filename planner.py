@@ -0,0 +1,108 @@
+# Подбор блюд и их порций, которые закрывают остаток дневной нормы калорий, белков, жиров и углеводов.
+# Все блюда базы данных оцениваются одной векторной операцией по коэффициентам на грамм,
+# а порции подбираются методом наименьших квадратов для небольшого числа лучших кандидатов
+
+# Импортирование numpy для расчётов по массивам состава блюд
+import numpy as np
+
+from calculator import MACRO_KCAL
+from instrumentation import timed
+
+
+# Во сколько раз точность по калориям важнее точности по каждому из белков, жиров и углеводов:
+# если остаток нормы нельзя закрыть точно, ошибка ложится в первую очередь на состав
+KCAL_WEIGHT = 3.0
+
+'''
+Предложенный набор блюд: номера блюд в базе данных, их порции в граммах,
+состав набора (ккал, белки, жиры, углеводы), цель и попадание в допуск по каждому учтённому показателю
+'''
+class MealPlan:
+    def __init__(self, dishes, weights, achieved, target, within) -> None:
+        self.dishes = dishes  # Номера блюд в базе данных
+        self.weights = weights  # Порции в граммах
+        self.achieved = achieved  # Ккал, белки, жиры, углеводы предложенного набора
+        self.target = target  # Остаток нормы по учтённым показателям
+        self.within = within  # Попадает ли набор в допуск по всем учтённым показателям
+
+    def __len__(self) -> int:
+        return len(self.dishes)
+
+    def items(self):
+        # Пары (номер блюда, порция в граммах)
+        return zip(self.dishes, self.weights)
+
+
+def scales(target: np.ndarray) -> np.ndarray:
+    # Множители, переводящие показатели в доли цели. Чтобы почти закрытый показатель не получал
+    # огромного веса, цель снизу ограничена 5% от остатка калорий в пересчёте на граммы
+    floor = 0.05 * max(float(target[0]), 1.0) / np.array((1.0,) + MACRO_KCAL)[:len(target)]
+    return 1.0 / np.maximum(target, floor)
+
+
+def fitWeights(columns: np.ndarray, goal: np.ndarray, minWeight: float, maxWeight: float) -> tuple:
+    # Порции для наборов блюд: columns - массив (наборы, показатели, блюда) в долях цели на грамм.
+    # Наименьшие квадраты для всех наборов сразу, затем порции ограничиваются допустимыми пределами
+    weights = np.linalg.pinv(columns) @ goal
+    weights = np.clip(weights, minWeight, maxWeight)
+    residual = np.linalg.norm(np.einsum("snd,sd->sn", columns, weights) - goal, axis=1)
+    return weights, residual
+
+
+@timed("planMeals")
+def planMeals(db, remaining, constraints: int = 4, tolerance: float = 0.1, dishes: int = 4, exclude=(),
+              candidates: int = 64, minWeight: float = 30.0, maxWeight: float = 500.0, step: float = 5.0) -> MealPlan:
+    # Подбор до dishes блюд, закрывающих остаток нормы remaining (ккал, белки, жиры, углеводы).
+    # constraints - сколько первых показателей учитывать (1 - только ккал), tolerance - допуск в долях цели,
+    # exclude - номера блюд, которые предлагать нельзя
+    target = np.maximum(np.asarray(remaining, dtype=np.float64)[:constraints], 0.0)
+    if target[0] <= 0 or not len(db):
+        return MealPlan([], [], np.zeros(constraints), target, target[0] <= 0)
+
+    # Вклад грамма каждого блюда в долях цели
+    scale = scales(target)
+    relative = db.perGram[:, :constraints] * scale
+    # Для подбора порций калории учитываются с большим весом
+    importance = np.ones(constraints)
+    importance[0] = KCAL_WEIGHT
+
+    # Оценка блюд: насколько соотношение показателей блюда похоже на соотношение в остатке нормы
+    norms = np.linalg.norm(relative, axis=1)
+    score = np.divide(relative.sum(axis=1), norms * np.sqrt(constraints), out=np.full(len(db), -np.inf),
+                      where=norms > 0)
+    if len(exclude):
+        score[np.asarray(list(exclude), dtype=np.intp)] = -np.inf
+    count = min(candidates, int(np.isfinite(score).sum()))
+    if count == 0:
+        return MealPlan([], [], np.zeros(constraints), target, False)
+    pool = [np.argpartition(-score, count - 1)[:count]]
+    # Точно закрыть остаток обычно помогают блюда, в которых преобладает один показатель,
+    # поэтому к кандидатам добавляются лучшие блюда по доле каждого показателя
+    for column in range(1, constraints):
+        share = np.where(np.isfinite(score), relative[:, column] / np.maximum(norms, 1e-12), -np.inf)
+        pool.append(np.argpartition(-share, count // 4 - 1)[:count // 4] if count >= 4 else np.argsort(-share)[:count])
+    pool = np.unique(np.concatenate(pool))
+    pool = pool[np.isfinite(score[pool])]
+    poolColumns = relative[pool] * importance  # (кандидаты, показатели)
+
+    # Жадный выбор: на каждом шаге добавляем кандидата, с которым остаток нормы закрывается точнее всего
+    chosen = []
+    best = np.inf
+    for _ in range(min(dishes, len(pool))):
+        free = np.setdiff1d(np.arange(len(pool)), chosen)
+        columns = np.concatenate([np.broadcast_to(poolColumns[chosen].T, (len(free), constraints, len(chosen))),
+                                  poolColumns[free][:, :, None]], axis=2)
+        _, residual = fitWeights(columns, importance, minWeight, maxWeight)
+        pick = int(np.argmin(residual))
+        if residual[pick] >= best * 0.99:
+            break  # Ещё одно блюдо почти ничего не даёт
+        best = residual[pick]
+        chosen.append(int(free[pick]))
+
+    # Окончательные порции, округлённые до шага
+    weights, _ = fitWeights(poolColumns[chosen].T[None], importance, minWeight, maxWeight)
+    weights = np.clip(np.round(weights[0] / step) * step, minWeight, maxWeight)
+    rows = pool[chosen]
+    achieved = db.perGram[rows].T @ weights
+    within = bool(np.all(np.abs(achieved[:constraints] - target) * scale <= tolerance))
+    return MealPlan(rows.tolist(), weights.tolist(), achieved, target, within)
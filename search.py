@@ -0,0 +1,188 @@
+# Импортирование модуля bisect для двоичного поиска в отсортированных списках
+import bisect
+import re
+
+# Импортирование numpy для хранения индекса триграмм и подсчёта совпадений нечёткого поиска
+import numpy as np
+
+
+# Знаки препинания, которые при поиске считаются пробелами
+_PUNCTUATION = re.compile(r"[,.;:()«»\"'/-]+")
+# Символ больше любого символа названия: строки от prefix до prefix + _LAST начинаются с prefix
+_LAST = "\U0010ffff"
+
+
+def fold(text: str) -> str:
+    # Приведение строки к виду для поиска: нижний регистр, "ё" как "е",
+    # знаки препинания как пробелы, слова разделены одним пробелом
+    return " ".join(_PUNCTUATION.sub(" ", text.lower().replace("ё", "е")).split())
+
+
+def padWords(text: str) -> str:
+    # Слова приведённой строки с пробелами по краям: так у начала и конца слова появляются свои триграммы
+    return "  " + text.replace(" ", "   ") + " " if text else ""
+
+
+'''
+Индекс для поиска блюд по названию при наборе текста.
+Строится один раз при загрузке базы данных и состоит из:
+- отсортированных названий, чтобы находить блюда, название которых начинается с набранного текста;
+- отсортированных "хвостов" названий, начинающихся со второго, третьего и т. д. слова,
+  чтобы находить блюда по началу любого слова;
+- триграмм (по три подряд идущих символа), чтобы находить блюда, даже если в запросе есть опечатка
+'''
+class DishSearchIndex:
+    # Сколько хвостов просматривается при поиске по нескольким словам, чтобы частые слова не тормозили поиск
+    SCAN_LIMIT = 200
+    # Триграммы, которые встречаются в большей доле названий, не учитываются в нечётком поиске
+    COMMON_TRIGRAM = 0.1
+
+    def __init__(self, names) -> None:
+        self.names = list(names)
+        self.folded = [fold(name) for name in self.names]
+        count = len(self.folded)
+
+        # Названия в алфавитном порядке и номера соответствующих блюд
+        order = sorted(range(count), key=self.folded.__getitem__)
+        self.sortedNames = [self.folded[row] for row in order]
+        self.sortedRows = np.array(order, dtype=np.int32)
+
+        # Хвосты названий, начинающиеся со второго и следующих слов, и номера блюд
+        suffixes, suffixRows = [], []
+        for row, name in enumerate(self.folded):
+            space = name.find(" ")
+            while space >= 0:
+                suffixes.append(name[space + 1:])
+                suffixRows.append(row)
+                space = name.find(" ", space + 1)
+        order = sorted(range(len(suffixes)), key=suffixes.__getitem__)
+        self.suffixes = [suffixes[i] for i in order]
+        self.suffixRows = np.array(suffixRows, dtype=np.int32)[order]
+
+        self.buildTrigrams()
+
+    def buildTrigrams(self) -> None:
+        # Индекс триграмм в компактном виде: отсортированные коды триграмм, для каждого кода -
+        # отрезок в массиве номеров блюд. Строится целиком средствами numpy
+        padded = [padWords(name) for name in self.folded]
+        lengths = np.fromiter((len(text) for text in padded), dtype=np.int64, count=len(padded))
+        text = "".join(padded)
+        chars = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        # Символы заменяются их номерами в алфавите названий, чтобы код триграммы был небольшим числом
+        alphabet = sorted(set(text))
+        self.alphabet = {char: i for i, char in enumerate(alphabet)}
+        size = len(alphabet) or 1
+        self.alphabetSize = size
+        letters = np.searchsorted(np.array([ord(char) for char in alphabet], dtype=np.uint32), chars)
+        letters = letters.astype(np.int64)
+
+        rows = np.repeat(np.arange(len(padded), dtype=np.int64), lengths)
+        # Триграммы не должны переходить через границу двух названий
+        valid = rows[:-2] == rows[2:] if len(rows) > 2 else np.zeros(0, dtype=bool)
+        codes = (letters[:-2] * size + letters[1:-1]) * size + letters[2:]
+        # Пары "триграмма, блюдо" без повторов, упорядоченные по коду триграммы
+        pairs = np.sort(codes[valid] * len(padded) + rows[:-2][valid])
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]] if len(pairs) else pairs
+        pairCodes, trigramRows = np.divmod(pairs, max(len(padded), 1))
+        self.trigramRows = trigramRows.astype(np.int32)
+        # Начало отрезка каждой триграммы в массиве номеров блюд
+        starts = np.flatnonzero(np.r_[True, pairCodes[1:] != pairCodes[:-1]]) if len(pairs) else pairs
+        self.trigramCodes = pairCodes[starts]
+        self.trigramStarts = np.append(starts, len(pairs))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, text: str, limit: int = 20) -> list:
+        # Номера блюд, подходящих к набранному тексту: сначала блюда, название которых начинается
+        # с запроса, затем - по началу любого слова; если таких нет - нечёткие совпадения по триграммам
+        query = fold(text)
+        if not query:
+            return []
+
+        result = []
+        seen = set()
+
+        def extend(rows) -> bool:
+            # Добавление найденных блюд без повторов; True, если результатов уже достаточно
+            for row in rows.tolist():
+                if row not in seen:
+                    seen.add(row)
+                    result.append(row)
+                    if len(result) == limit:
+                        return True
+            return False
+
+        # Название начинается с запроса
+        start = bisect.bisect_left(self.sortedNames, query)
+        stop = bisect.bisect_left(self.sortedNames, query + _LAST, start, min(start + limit, len(self.sortedNames)))
+        if extend(self.sortedRows[start:stop]):
+            return result
+        # Одно из следующих слов названия начинается с запроса
+        start = bisect.bisect_left(self.suffixes, query)
+        stop = bisect.bisect_left(self.suffixes, query + _LAST, start, min(start + 2 * limit, len(self.suffixes)))
+        if extend(self.suffixRows[start:stop]):
+            return result
+        # Слова запроса встречаются в названии в другом порядке
+        words = query.split(" ")
+        if len(words) > 1:
+            extend(np.array(self.wordsSearch(words), dtype=np.int32))
+        if not result:
+            extend(np.array(self.fuzzySearch(query, limit), dtype=np.int32))
+        return result
+
+    def wordsSearch(self, words: list) -> list:
+        # Находим названия, где с самого длинного слова запроса начинается какое-либо слово,
+        # и оставляем те, где есть начала и всех остальных слов запроса
+        longest = max(words, key=len)
+        rows = []
+        for names, namesRows in ((self.sortedNames, self.sortedRows), (self.suffixes, self.suffixRows)):
+            start = bisect.bisect_left(names, longest)
+            stop = bisect.bisect_left(names, longest + _LAST, start, min(start + self.SCAN_LIMIT, len(names)))
+            rows.extend(namesRows[start:stop].tolist())
+        return [row for row in rows if self.hasWordPrefixes(self.folded[row], words)]
+
+    @staticmethod
+    def hasWordPrefixes(name: str, words: list) -> bool:
+        # Есть ли в названии слова, начинающиеся со всех слов запроса
+        nameWords = name.split(" ")
+        return all(any(nameWord.startswith(word) for nameWord in nameWords) for word in words)
+
+    def queryTrigrams(self, text: str) -> np.ndarray:
+        # Коды триграмм строки; триграммы с символами, которых нет ни в одном названии, пропускаются
+        padded = padWords(text)
+        size = self.alphabetSize
+        codes = set()
+        for i in range(len(padded) - 2):
+            letters = [self.alphabet.get(char) for char in padded[i:i + 3]]
+            if None not in letters:
+                codes.add((letters[0] * size + letters[1]) * size + letters[2])
+        return np.array(sorted(codes), dtype=np.int64)
+
+    def fuzzySearch(self, query: str, limit: int) -> list:
+        # Нечёткий поиск: блюда с наибольшим числом общих с запросом триграмм
+        codes = self.queryTrigrams(query)
+        # Находим триграммы запроса в индексе
+        found = np.searchsorted(self.trigramCodes, codes)
+        known = found < len(self.trigramCodes)
+        known[known] = self.trigramCodes[found[known]] == codes[known]
+        found = found[known]
+        if not len(found):
+            return []
+
+        starts, stops = self.trigramStarts[found], self.trigramStarts[found + 1]
+        # Слишком частые триграммы почти ничего не говорят о блюде, но дорого обходятся
+        rare = stops - starts <= max(self.COMMON_TRIGRAM * len(self.names), limit)
+        if rare.any():
+            starts, stops = starts[rare], stops[rare]
+        hits = np.concatenate([self.trigramRows[a:b] for a, b in zip(starts.tolist(), stops.tolist())])
+        scores = np.bincount(hits, minlength=len(self.names))
+
+        # Требуем совпадения хотя бы половины учтённых триграмм запроса
+        candidates = np.flatnonzero(scores >= max(1, (len(starts) + 1) // 2))
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+        # Лучшие совпадения первыми, при равенстве - более короткие названия
+        lengths = np.fromiter((len(self.folded[row]) for row in candidates.tolist()), dtype=np.int64,
+                              count=len(candidates))
+        return candidates[np.lexsort((lengths, -scores[candidates]))].tolist()
@@ -0,0 +1,98 @@
+# Проверки базы данных блюд (database.py)
+import json
+import os
+import sys
+
+# Добавляем корень репозитория в путь поиска модулей
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from database import Database
+
+
+def testDuplicateNamesKeepFirstPositionAndLastValues():
+    # Повторяющееся блюдо стоит на месте первого вхождения, а состав берётся из последнего
+    names = ["Борщ", "Каша", "Борщ", "Чай", "Борщ", "Каша"]
+    values = np.arange(30, dtype=np.float64).reshape(6, 5) + 1
+    db = Database.fromColumns(names, values)
+    assert db.dishesNames == ["Борщ", "Каша", "Чай"]
+    assert db.values.tolist() == [values[4].tolist(), values[5].tolist(), values[3].tolist()]
+    assert db.find("Чай") == 2
+
+
+def testEmptyColumns():
+    db = Database.fromColumns([], np.zeros((0, 5)))
+    assert len(db) == 0
+    assert db.values.shape == (0, 5)
+
+
+def writeCatalogue(path, rows):
+    pd.DataFrame(rows, columns=["Блюдо", "Вес,г", "Ккал", "Белки,г", "Жры,г", "Углеводы,г"]).to_excel(path, index=False)
+
+
+def testCorruptNamesSnapshotIsRebuilt(tmp_path):
+    # Повреждённый файл названий в снимке не мешает запуску: база данных читается заново из excel файла
+    path = str(tmp_path / "блюда.xlsx")
+    writeCatalogue(path, [["Борщ", 250, 120, 5, 4, 15], ["Чай", 200, 2, 0, 0, 0.5]])
+    Database(path)
+    with open(os.path.join(Database.cachePath(path), "names.bin"), "wb") as f:
+        f.write(b"\xff\xfe\x00\xff")
+    assert not Database().loadCache(path)
+    db = Database(path)
+    assert db.dishesNames == ["Борщ", "Чай"]
+    assert Database().loadCache(path)
+
+
+def testDiffAndKeepOrder():
+    # Блюдо удалено из середины, одно добавлено и одно изменено: порядок оставшихся блюд прежний,
+    # добавленное идёт в конце, удалённое отображается в -1
+    old = Database.fromColumns(["Борщ", "Каша", "Чай", "Сок"], np.arange(20, dtype=np.float64).reshape(4, 5) + 1)
+    values = np.array([old.values[3], old.values[2] * 2, old.values[0], np.full(5, 7.0)])
+    new = Database.fromColumns(["Сок", "Чай", "Борщ", "Суп"], values)
+    assert old.diff(new) == (["Суп"], ["Каша"], ["Чай"])
+
+    ordered, mapping = old.keepOrder(new)
+    assert ordered.dishesNames == ["Борщ", "Чай", "Сок", "Суп"]
+    assert ordered.values.tolist() == [old.values[0].tolist(), (old.values[2] * 2).tolist(),
+                                       old.values[3].tolist(), [7.0] * 5]
+    assert mapping.tolist() == [0, -1, 1, 2]
+    assert old.diff(old) == ([], [], [])
+
+
+def snapshotUsed(path):
+    # Прочитана ли база данных из снимка (а не из excel файла)
+    return Database().loadCache(path)
+
+
+def testSnapshotFollowsFileContents(tmp_path):
+    path = str(tmp_path / "блюда.xlsx")
+    writeCatalogue(path, [["Борщ", 250, 120, 5, 4, 15], ["Чай", 200, 2, 0, 0, 0.5]])
+    Database(path)
+    assert snapshotUsed(path)
+
+    # Изменилось только время файла: снимок остаётся действительным, а новое время запоминается
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert snapshotUsed(path)
+    with open(os.path.join(Database.cachePath(path), "meta.json"), encoding="utf-8") as f:
+        assert json.load(f)["mtime"] == stat.st_mtime_ns + 10 ** 9
+
+    # Изменилось содержимое: снимок пересобирается
+    writeCatalogue(path, [["Борщ", 250, 150, 5, 4, 15], ["Каша", 200, 180, 6, 3, 32]])
+    assert not snapshotUsed(path)
+    db = Database(path)
+    assert db.dishesNames == ["Борщ", "Каша"]
+    assert db.kcal.tolist() == [150.0, 180.0]
+    assert snapshotUsed(path)
+
+
+def testSnapshotOfOtherVersionIsRebuilt(tmp_path, monkeypatch):
+    path = str(tmp_path / "блюда.xlsx")
+    writeCatalogue(path, [["Борщ", 250, 120, 5, 4, 15]])
+    Database(path)
+    monkeypatch.setattr(Database, "CACHE_VERSION", Database.CACHE_VERSION + 1)
+    assert not snapshotUsed(path)
+    assert Database(path).dishesNames == ["Борщ"]
+    assert snapshotUsed(path)
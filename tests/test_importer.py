@@ -0,0 +1,54 @@
+# Проверки импорта базы данных из нескольких файлов и листов (importer.py)
+import os
+import sys
+
+# Добавляем корень репозитория в путь поиска модулей
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import importer
+
+HEADERS = ["Блюдо", "Вес,г", "Ккал", "Белки,г", "Жры,г", "Углеводы,г"]
+
+
+def testMergeColumnsConflictRules():
+    # Борщ встречается в двух наборах с разным составом, Чай - с одинаковым
+    first = (["Борщ", "Чай"], np.array([[250, 120, 5, 4, 15], [200, 2, 0, 0, 0.5]], dtype=np.float64))
+    second = (["Каша", "Борщ", "Чай"], np.array([[200, 180, 6, 3, 32], [100, 80, 4, 2, 10],
+                                                [200, 2, 0, 0, 0.5]], dtype=np.float64))
+
+    db, conflicts = importer.mergeColumns([first, second], importer.LAST)
+    assert db.dishesNames == ["Борщ", "Чай", "Каша"]
+    assert db.row(0).tolist() == [100, 80, 4, 2, 10]
+    assert conflicts == ["Борщ"]
+
+    db, conflicts = importer.mergeColumns([first, second], importer.FIRST)
+    assert db.dishesNames == ["Борщ", "Чай", "Каша"]
+    assert db.row(0).tolist() == [250, 120, 5, 4, 15]
+    assert conflicts == ["Борщ"]
+
+    with pytest.raises(ValueError):
+        importer.mergeColumns([first], "middle")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def testImportCatalogueReadsAllSheets(tmp_path, workers):
+    # Листы объединяются в порядке файлов и листов; пустой лист пропускается
+    soups, drinks = str(tmp_path / "супы.xlsx"), str(tmp_path / "напитки.xlsx")
+    with pd.ExcelWriter(soups) as writer:
+        pd.DataFrame([["Борщ", 250, 120, 5, 4, 15]], columns=HEADERS).to_excel(writer, sheet_name="обед", index=False)
+        pd.DataFrame([["Солянка", 300, 270, 15, 12, 9], ["Борщ", 100, 80, 4, 2, 10]],
+                     columns=HEADERS).to_excel(writer, sheet_name="ужин", index=False)
+        pd.DataFrame().to_excel(writer, sheet_name="пусто", index=False)
+    pd.DataFrame([["Чай", 200, 2, 0, 0, 0.5]], columns=HEADERS).to_excel(drinks, index=False)
+
+    db, report = importer.importCatalogue([soups, drinks], workers=workers, prefer=importer.FIRST)
+    assert db.dishesNames == ["Борщ", "Солянка", "Чай"]
+    assert db.row(0).tolist() == [250, 120, 5, 4, 15]
+    assert report.conflicts == ["Борщ"]
+    assert [(os.path.basename(path), sheet, rows) for path, sheet, rows, _ in report.sheets] == [
+        ("супы.xlsx", "обед", 1), ("супы.xlsx", "ужин", 2), ("супы.xlsx", "пусто", 0), ("напитки.xlsx", "Sheet1", 1)]
+    assert "конфликт: Борщ" in report.format()
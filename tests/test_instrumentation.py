@@ -0,0 +1,39 @@
+# Проверки замера времени (instrumentation.py)
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Добавляем корень репозитория в путь поиска модулей
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6 import QtCore
+
+import instrumentation
+
+
+def testTimedSlotAcceptsSignalArguments(monkeypatch):
+    # Слот без аргументов, обёрнутый замером, вызывается сигналами с аргументами (textEdited, toggled)
+    monkeypatch.setattr(instrumentation, "enabled", True)
+    monkeypatch.setattr(instrumentation, "histograms", {})
+
+    class Sender(QtCore.QObject):
+        text = QtCore.Signal(str)
+        flag = QtCore.Signal(bool)
+
+    class Receiver(QtCore.QObject):
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+
+        @QtCore.Slot()
+        @instrumentation.timed("Receiver.update")
+        def update(self):
+            self.calls += 1
+
+    sender, receiver = Sender(), Receiver()
+    sender.text.connect(receiver.update)
+    sender.flag.connect(receiver.update)
+    sender.text.emit("25")
+    sender.flag.emit(True)
+    assert receiver.calls == 2
+    assert instrumentation.histograms["Receiver.update"].count == 2
@@ -0,0 +1,335 @@
+# Проверки окна приложения без дисплея (платформа offscreen)
+import datetime
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Добавляем корень репозитория в путь поиска модулей
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+import shiboken6
+from PySide6 import QtCore, QtWidgets
+from PySide6.QtCore import Qt
+
+import main
+from journal import Journal
+
+
+@pytest.fixture(scope="module")
+def application():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def excelPath(tmp_path):
+    # Небольшая база данных блюд в excel файле
+    path = str(tmp_path / "блюда.xlsx")
+    pd.DataFrame({
+        "Блюдо": ["Борщ", "Каша", "Чай"],
+        "Вес,г": [250.0, 200.0, 200.0],
+        "Ккал": [120.0, 180.0, 2.0],
+        "Белки,г": [5.0, 6.0, 0.0],
+        "Жры,г": [4.0, 3.0, 0.0],
+        "Углеводы,г": [15.0, 32.0, 0.5],
+    }).to_excel(path, index=False)
+    return path
+
+
+def waitForCatalogue(application, window, timeout=10000):
+    # Ждём окончания загрузки базы данных в фоновом потоке
+    loop = QtCore.QEventLoop()
+    window.catalogueLoaded.connect(loop.quit)
+    QtCore.QTimer.singleShot(timeout, loop.quit)
+    loop.exec()
+    application.processEvents()
+
+
+def testAppendButtonSurvivesRestore(application, excelPath, tmp_path):
+    # Восстановление дневника из журнала не должно удалять кнопку " + "
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    journal.add(datetime.date.today(), journal.newEntry(), "Каша", [200.0, 180.0, 6.0, 3.0, 32.0])
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+
+    assert window.log.restored
+    assert window.log.count == 1
+    assert shiboken6.isValid(window.addBtn)
+    assert window.table.indexWidget(window.log.index(window.log.buttonRow(), 3)) is window.addBtn
+
+    window.addBtn.click()
+    assert window.log.count == 2
+    assert window.log.dishName(1) == "Борщ"
+    assert len(journal.day(datetime.date.today())) == 2
+
+    # Повторная загрузка базы данных (например, после добавления файла) тоже работает с кнопкой
+    window.setCatalogue((window.db, window.searchIndex, ""))
+    assert shiboken6.isValid(window.addBtn)
+    assert window.addBtn.isEnabled()
+    window.close()
+    journal.close()
+
+
+def testNewDayStartsEmptyLog(application, excelPath, tmp_path):
+    # Блюда, добавленные после полуночи, записываются в журнал нового дня
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+    today = datetime.date.today()
+    yesterday = today - datetime.timedelta(days=1)
+    # Окно открыто со вчерашнего дня, а таймер полуночи не сработал (например, компьютер спал)
+    window.log.setDay(yesterday)
+    journal.add(yesterday, journal.newEntry(), "Чай", [200.0, 2.0, 0.0, 0.0, 0.5])
+    window.log.restoreDay()
+    assert window.log.count == 1
+
+    # День меняется при добавлении блюда: вчерашний дневник не пополняется
+    window.addItem()
+    assert window.log.day == today
+    assert window.log.count == 1
+    assert len(journal.day(yesterday)) == 1
+    assert len(journal.day(today)) == 1
+    assert shiboken6.isValid(window.addBtn)
+
+    # Таймер полуночи очищает дневник
+    window.log.setDay(today + datetime.timedelta(days=1))
+    assert window.log.count == 0
+    window.close()
+    journal.close()
+
+
+def testDishEditorKeepsWeight(application, excelPath, tmp_path):
+    # Переход через ячейку блюда без выбора другого блюда не сбрасывает вес и не пишет в журнал
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+    window.addItem()
+    log, delegate = window.log, window.delegate
+    log.setData(log.index(0, log.WEIGHT), 250.0)
+    records = journal.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    index = log.index(0, log.DISH)
+    editor = delegate.createEditor(window.table.viewport(), QtWidgets.QStyleOptionViewItem(), index)
+    delegate.setEditorData(editor, index)
+    delegate.setModelData(editor, log, index)
+    assert log.editValue(log.index(0, log.WEIGHT)) == 250.0
+    assert journal.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == records
+
+    # Выбор другого блюда по-прежнему записывается
+    editor.setCurrentIndex(2)
+    delegate.setModelData(editor, log, index)
+    assert log.dishName(0) == "Чай"
+    editor.deleteLater()
+    window.close()
+    journal.close()
+
+
+def testWeightEditorRejectsSecondDot(application, excelPath, tmp_path):
+    # Вторая точка в поле веса не принимается, а вес остаётся последним правильным значением
+    from PySide6.QtTest import QTest
+    window = main.MyApp(excelPath=excelPath)
+    waitForCatalogue(application, window)
+    window.addItem()
+    log, delegate = window.log, window.delegate
+    index = log.index(0, log.WEIGHT)
+    editor = delegate.createEditor(window.table.viewport(), QtWidgets.QStyleOptionViewItem(), index)
+    delegate.commitData.connect(lambda widget: delegate.setModelData(widget, log, index))
+    editor.clear()
+    QTest.keyClicks(editor, "1..5")
+    assert editor.text() == "1.5"
+    assert log.editValue(index) == 1.5
+    editor.deleteLater()
+    window.close()
+
+
+def testRemoveButtonNeedsLeftClick(application, excelPath):
+    # Строку удаляет только щелчок левой кнопкой мыши по кнопке "X"
+    from PySide6.QtTest import QTest
+    window = main.MyApp(excelPath=excelPath)
+    waitForCatalogue(application, window)
+    window.show()
+    window.addItem()
+    window.addItem()
+    log, viewport = window.log, window.table.viewport()
+
+    def center(row, column):
+        return window.table.visualRect(log.index(row, column)).center()
+
+    QTest.mouseClick(viewport, Qt.RightButton, pos=center(0, log.REMOVE))
+    assert log.count == 2
+    # Перетаскивание, которое заканчивается на кнопке "X"
+    QTest.mousePress(viewport, Qt.LeftButton, pos=center(1, log.WEIGHT))
+    QTest.mouseRelease(viewport, Qt.LeftButton, pos=center(1, log.REMOVE))
+    assert log.count == 2
+    QTest.mouseClick(viewport, Qt.LeftButton, pos=center(0, log.REMOVE))
+    assert log.count == 1
+    window.close()
+
+
+def testOrphanRowKeepsCompositionAfterZeroWeight(application, excelPath, tmp_path):
+    # Строка с удалённым из базы данных блюдом пересчитывается по прежним коэффициентам на грамм,
+    # даже если её вес был нулевым
+    from database import Database
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+    window.addItem()
+    log = window.log
+    old = window.db
+    new = Database.fromColumns(old.dishesNames[1:], old.values[1:])
+    ordered, mapping = old.keepOrder(new)
+    window.applyCatalogueChanges((ordered, window.searchIndex, mapping, *old.diff(new)))
+    assert log.dishName(0) == "Борщ"
+
+    log.setWeight(0, 0.0)
+    log.setWeight(0, 125.0)
+    assert list(log.values[0]) == pytest.approx([125.0, 60.0, 2.5, 2.0, 7.5])
+    assert journal.day(datetime.date.today())[0][2] == pytest.approx([125.0, 60.0, 2.5, 2.0, 7.5])
+    window.close()
+    journal.close()
+
+
+def waitForReload(application, window, timeout=30000):
+    # Ждём применения изменений базы данных из фонового потока
+    loop = QtCore.QEventLoop()
+    window.catalogueReloaded.connect(loop.quit)
+    QtCore.QTimer.singleShot(timeout, loop.quit)
+    loop.exec()
+    application.processEvents()
+
+
+def testMergedFileRescalesLoggedDish(application, excelPath, tmp_path):
+    # Добавленный файл с другим составом блюда пересчитывает строки дневника с этим блюдом
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+    window.addItem()
+    log = window.log
+    log.setWeight(0, 125.0)
+    extra = str(tmp_path / "супы.xlsx")
+    pd.DataFrame({"Блюдо": ["Борщ", "Солянка"], "Вес,г": [100.0, 300.0], "Ккал": [80.0, 270.0],
+                  "Белки,г": [4.0, 15.0], "Жры,г": [2.0, 12.0], "Углеводы,г": [10.0, 9.0]}).to_excel(extra, index=False)
+
+    window.add_read_file(extra)
+    waitForReload(application, window)
+    assert window.readFiles == [extra]
+    assert log.dishName(0) == "Борщ"
+    assert list(log.values[0]) == pytest.approx([125.0, 100.0, 5.0, 2.5, 12.5])
+    assert log.totals.sums[1] == pytest.approx(100.0)
+    assert journal.day(datetime.date.today())[0][2] == pytest.approx([125.0, 100.0, 5.0, 2.5, 12.5])
+    assert window.dishModel.stringList() == ["Борщ", "Каша", "Чай", "Солянка"]
+    assert "Борщ" in window.readFileName.toolTip()
+    assert window.openFileBtn.isEnabled()
+    window.close()
+    journal.close()
+
+
+def testWeightEditorJournalsOnClose(application, excelPath, tmp_path):
+    # Вес, набранный в редакторе, обновляет итоги при каждом нажатии, а в журнал пишется один раз
+    # (эталонная порция борща - 250 г)
+    from PySide6.QtTest import QTest
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+    window.show()
+    window.addItem()
+    log = window.log
+
+    def records():
+        return journal.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    before = records()
+    index = log.index(0, log.WEIGHT)
+    window.table.setCurrentIndex(index)
+    window.table.edit(index)
+    editor = window.table.focusWidget()
+    assert isinstance(editor, QtWidgets.QLineEdit)
+    editor.selectAll()
+    QTest.keyClicks(editor, "150")
+    assert log.totals.sums[0] == 150.0
+    assert records() == before
+
+    window.table.setCurrentIndex(log.index(0, 2))
+    application.processEvents()
+    assert records() == before + 1
+    assert journal.day(datetime.date.today())[0][2][0] == 150.0
+    assert journal.total(datetime.date.today(), datetime.date.today())[0] == 150.0
+    window.close()
+    journal.close()
+
+
+def testJournalFallsBackToWritableLocation(tmp_path):
+    # Если журнал нельзя создать в папке приложения, он создаётся в следующей папке, а если нигде - не создаётся
+    blocked = tmp_path / "файл"
+    blocked.write_text("")
+    journal = main.openJournal([str(blocked), str(tmp_path / "пользователь")])
+    assert journal.path == str(tmp_path / "пользователь" / "дневник.sqlite")
+    journal.close()
+    assert main.openJournal([str(blocked)]) is None
+
+
+def testPendingWeightKeepsDailyTotalsConsistent(application, excelPath, tmp_path):
+    # Строка удалена или блюдо заменено, пока вес ещё не записан из редактора: суммы дня в журнале верные
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+    window.addItem()
+    window.addItem()
+    log, today = window.log, datetime.date.today()
+    log.setWeight(0, 100.0, journal=False)
+    log.setDish(0, 2)
+    log.setWeight(1, 50.0, journal=False)
+    log.removeEntry(1)
+    assert journal.total(today, today) == pytest.approx(log.totals.sums)
+    assert log.pending == {}
+    window.close()
+    journal.close()
+
+
+@pytest.mark.parametrize("maxRowChanges", [0, 32])
+def testCatalogueChangesUpdateLog(application, excelPath, tmp_path, maxRowChanges):
+    # Из базы данных удалено блюдо из середины, добавлено новое и изменён состав блюда, которое есть в дневнике.
+    # Список блюд одинаков и при построчном обновлении, и при полной замене (изменений больше MAX_ROW_CHANGES)
+    from database import Database
+    journal = Journal(str(tmp_path / "дневник.sqlite"))
+    window = main.MyApp(excelPath=excelPath, journal=journal)
+    waitForCatalogue(application, window)
+    window.MAX_ROW_CHANGES = maxRowChanges
+    log, today = window.log, datetime.date.today()
+    for dish, weight in ((1, 100.0), (0, 125.0), (2, 200.0)):
+        window.addItem()
+        log.setDish(log.count - 1, dish)
+        log.setWeight(log.count - 1, weight)
+
+    records = journal.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    old = window.db
+    new = Database.fromColumns(["Борщ", "Чай", "Суп"], np.array(
+        [[100.0, 80.0, 4.0, 2.0, 10.0], old.row(2), [300.0, 90.0, 3.0, 3.0, 12.0]]))
+    ordered, mapping = old.keepOrder(new)
+    window.applyCatalogueChanges((ordered, window.searchIndex, mapping, *old.diff(new)))
+
+    assert window.dishModel.stringList() == ["Борщ", "Чай", "Суп"]
+    # Строка с удалённым блюдом сохраняет название и состав, строка с изменённым блюдом пересчитана
+    assert [log.dishName(row) for row in range(log.count)] == ["Каша", "Борщ", "Чай"]
+    assert log.item(0, log.DISH).text() == "Каша"
+    assert list(log.values[0]) == pytest.approx([100.0, 90.0, 3.0, 1.5, 16.0])
+    assert list(log.values[1]) == pytest.approx([125.0, 100.0, 5.0, 2.5, 12.5])
+    assert log.item(1, 2).text() == "100"
+    assert log.totals.sums == pytest.approx([425.0, 192.0, 8.0, 4.0, 29.0])
+    assert log.item(log.totalsRow(), 2).text() == "192.00"
+    # Журнал: одна запись о пересчёте строки с изменённым блюдом, суммы дня совпадают с итогами
+    assert journal.connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == records + 1
+    assert [(dish, values) for _, dish, values in journal.day(today)] == [
+        ("Каша", pytest.approx([100.0, 90.0, 3.0, 1.5, 16.0])),
+        ("Борщ", pytest.approx([125.0, 100.0, 5.0, 2.5, 12.5])),
+        ("Чай", pytest.approx([200.0, 2.0, 0.0, 0.0, 0.5]))]
+    assert journal.total(today, today) == pytest.approx(log.totals.sums)
+
+    # Дневник, восстановленный из журнала, совпадает с текущим
+    window.log.restoreDay()
+    assert [log.dishName(row) for row in range(log.count)] == ["Каша", "Борщ", "Чай"]
+    assert log.totals.sums == pytest.approx([425.0, 192.0, 8.0, 4.0, 29.0])
+    window.close()
+    journal.close()
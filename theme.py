@@ -0,0 +1,116 @@
+# Применение стилевой темы qt_material вместе с собственными стилями приложения из style.css.
+# Сборка темы (шаблон jinja, иконки) занимает заметное время при каждом запуске, поэтому готовая
+# таблица стилей сохраняется в снимок рядом с приложением, а qt_material импортируется только при сборке
+
+# Импортирование модулей для работы с файлами снимка темы
+import importlib.util
+import json
+import os
+
+# Импортирование необходимых модулей из библиотеки PySide6
+from PySide6.QtCore import QDir
+from PySide6.QtGui import QColor, QFontDatabase, QGuiApplication, QPalette
+
+from instrumentation import timed
+
+
+basedir = os.path.dirname(__file__)  # Папка приложения
+
+# Тема по умолчанию и файл собственных стилей приложения
+THEME = "light_orange.xml"
+CSS_PATH = os.path.join(basedir, "style.css")
+# Папка снимка собранной темы
+CACHE_DIR = os.path.join(basedir, "theme.cache")
+# Версия формата снимка; при изменении формата старые снимки пересобираются
+CACHE_VERSION = 1
+
+
+def packageDir() -> str:
+    # Папка пакета qt_material, найденная без его импорта
+    spec = importlib.util.find_spec("qt_material")
+    return list(spec.submodule_search_locations)[0]
+
+
+def cacheKey(theme: str) -> dict:
+    # Всё, от чего зависит собранная таблица стилей: тема, версия qt_material и файл style.css
+    stat = os.stat(CSS_PATH)
+    package = packageDir()
+    return {
+        "version": CACHE_VERSION,
+        "theme": theme,
+        "package": package,
+        "packageTime": os.stat(package).st_mtime_ns,
+        "css": [stat.st_mtime_ns, stat.st_size],
+    }
+
+
+def loadCache(key: dict):
+    # Таблица стилей и параметры темы из снимка или None, если снимка нет или он устарел
+    try:
+        with open(os.path.join(CACHE_DIR, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["key"] != key or not os.path.isdir(meta["icons"]):
+            return None
+        with open(os.path.join(CACHE_DIR, "stylesheet.qss"), "r", encoding="utf-8") as f:
+            return f.read(), meta
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def saveCache(key: dict, stylesheet: str, meta: dict) -> None:
+    # Сохранение снимка; meta.json пишется последним, поэтому прерванная запись не даст снимку совпасть
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = os.path.join(CACHE_DIR, "stylesheet.qss")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(stylesheet)
+        os.replace(path + ".tmp", path)
+        path = os.path.join(CACHE_DIR, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"key": key, **meta}, f)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass  # Снимок - только ускорение; если записать его не удалось, работаем без него
+
+
+def buildStylesheet(theme: str) -> tuple:
+    # Полная сборка темы средствами qt_material (шрифты, иконки, палитра) и добавление style.css
+    from qt_material import build_stylesheet, get_theme
+    from qt_material.resources import RESOURCES_PATH
+    stylesheet = build_stylesheet(theme)
+    with open(CSS_PATH, "r") as f:
+        stylesheet += "\n" + f.read()
+    meta = {
+        "icons": os.path.join(RESOURCES_PATH, "theme"),
+        "primaryColor": get_theme(theme)["primaryColor"],
+    }
+    return stylesheet, meta
+
+
+def restoreTheme(meta: dict) -> None:
+    # То, что qt_material делает при сборке помимо таблицы стилей: шрифты, пути к иконкам и цвет текста
+    fonts = os.path.join(packageDir(), "fonts", "roboto")
+    for font in os.listdir(fonts):
+        if font.endswith(".ttf"):
+            QFontDatabase.addApplicationFont(os.path.join(fonts, font))
+    QDir.addSearchPath("icon", meta["icons"])
+    QDir.addSearchPath("qt_material", os.path.join(packageDir(), "resources"))
+    palette = QGuiApplication.palette()
+    color = meta["primaryColor"]
+    palette.setColor(QPalette.ColorRole.Text, QColor(*[int(color[i:i + 2], 16) for i in range(1, 6, 2)], 92))
+    QGuiApplication.setPalette(palette)
+
+
+@timed("applyTheme")
+def applyTheme(application, theme: str = THEME) -> None:
+    # Применение темы и стилей приложения одной таблицей стилей на всё приложение
+    application.setStyle("Fusion")
+    key = cacheKey(theme)
+    cached = loadCache(key)
+    if cached is None:
+        stylesheet, meta = buildStylesheet(theme)
+        saveCache(key, stylesheet, meta)
+    else:
+        stylesheet, meta = cached
+        restoreTheme(meta)
+    application.setStyleSheet(stylesheet)